@@ -12,6 +12,28 @@ login_manager = LoginManager()
 login_manager.login_view = "auth.login"
 csrf = CSRFProtect()
 
+# Blueprints import the extensions above, so they must come after them.
+from app.admin import bp as admin_bp  # noqa: E402
+from app.auth import bp as auth_bp  # noqa: E402
+from app.calendar import bp as calendar_bp  # noqa: E402
+from app.commands import register_commands  # noqa: E402
+from app.regattas import bp as regattas_bp  # noqa: E402
+
+# RSVP display order: Yes, No, Maybe, then anything unexpected
+_RSVP_STATUS_ORDER = {"yes": 0, "no": 1, "maybe": 2}
+
+
+def sort_rsvps(rsvps):
+    """Sort RSVPs by status, then by the crew member's display name."""
+    # Build each key once up front; the index breaks ties so RSVP objects
+    # themselves are never compared.
+    keyed = [
+        (_RSVP_STATUS_ORDER.get(r.status, 3), r.user.display_name, i, r)
+        for i, r in enumerate(rsvps)
+    ]
+    keyed.sort()
+    return [k[-1] for k in keyed]
+
 
 def create_app(test_config=None):
     app = Flask(__name__)
@@ -24,29 +46,17 @@ def create_app(test_config=None):
     login_manager.init_app(app)
     csrf.init_app(app)
 
-    from app.admin import bp as admin_bp
-    from app.auth import bp as auth_bp
-    from app.calendar import bp as calendar_bp
-    from app.regattas import bp as regattas_bp
-
     app.register_blueprint(admin_bp)
     app.register_blueprint(auth_bp)
     app.register_blueprint(calendar_bp)
     app.register_blueprint(regattas_bp)
 
-    from app.commands import register_commands
-
     register_commands(app)
 
     @app.context_processor
     def inject_version():
         return {"app_version": __version__}
 
-    @app.template_filter("sort_rsvps")
-    def sort_rsvps(rsvps):
-        order = {"yes": 0, "no": 1, "maybe": 2}
-        return sorted(
-            rsvps, key=lambda r: (order.get(r.status, 3), r.user.display_name)
-        )
+    app.add_template_filter(sort_rsvps, "sort_rsvps")
 
     return app
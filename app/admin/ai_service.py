@@ -1,11 +1,25 @@
-import json
+import hashlib
 import logging
+import re
+import threading
+from collections import OrderedDict
 
-import anthropic
+import orjson
 from flask import current_app
 
 logger = logging.getLogger(__name__)
 
+CLAUDE_MODEL = "claude-sonnet-4-20250514"
+
+# Number of AI responses kept in the per-app cache
+AI_CACHE_SIZE = 256
+# Discovery calls Claude from worker threads, and gunicorn serves requests on
+# threads too; lookups reorder the cache, so every access goes through this
+_ai_cache_lock = threading.Lock()
+
+# Opening ```json (or bare ```) line and closing ``` of a markdown code fence
+_CODE_FENCE_RE = re.compile(r"^```[a-zA-Z]*[ \t]*\n|\n?```\s*$")
+
 EXTRACTION_PROMPT = """\
 You are a data extraction assistant. Extract regatta/sailing event information \
 from the provided text and return a JSON array.
@@ -101,20 +115,77 @@ Page content:
 {content}"""
 
 
-def extract_regattas(content: str, year: int) -> list[dict]:
-    """Send content to Claude API and return extracted regatta data."""
+def _get_client():
+    """Return the app's Anthropic client, creating it on first use.
+
+    The client is cached on the app so its HTTP connection pool (and the
+    TLS sessions in it) is reused across calls instead of rebuilt each time.
+    ``anthropic`` (and its httpx/pydantic stack) is imported here rather than
+    at module load so app startup doesn't pay for it until the AI is used.
+    """
+    import anthropic
+
     api_key = current_app.config.get("ANTHROPIC_API_KEY")
     if not api_key:
         raise ValueError("ANTHROPIC_API_KEY is not configured.")
 
-    client = anthropic.Anthropic(api_key=api_key)
+    cached = current_app.extensions.get("anthropic_client")
+    if cached is None or cached[0] != api_key:
+        cached = (api_key, anthropic.Anthropic(api_key=api_key))
+        current_app.extensions["anthropic_client"] = cached
+    return cached[1]
 
-    prompt = EXTRACTION_PROMPT.format(year=year, content=content)
 
+def _cache_key(prompt: str) -> bytes:
+    return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest()
+
+
+def _get_cached_response(prompt: str) -> str | None:
+    """Return the cached raw AI response for an identical prompt, if any.
+
+    Admins often re-import the same page while iterating; a hit skips a
+    multi-second Claude round trip. The raw text is cached (not the parsed
+    list) so callers can mutate their results freely.
+    """
+    cache = current_app.extensions.get("ai_cache")
+    if cache is None:
+        return None
+    key = _cache_key(prompt)
+    with _ai_cache_lock:
+        raw = cache.get(key)
+        if raw is not None:
+            cache.move_to_end(key)
+    return raw
+
+
+def _cache_response(prompt: str, raw: str) -> None:
+    """Store a successfully parsed AI response, evicting the oldest entry."""
+    cache = current_app.extensions.setdefault("ai_cache", OrderedDict())
+    key = _cache_key(prompt)
+    with _ai_cache_lock:
+        cache[key] = raw
+        cache.move_to_end(key)
+        while len(cache) > AI_CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+def _call_claude(prompt: str, max_tokens: int = 1024) -> list:
+    """Send a prompt to Claude and return the parsed JSON array.
+
+    Shared by every public extraction/discovery function so caching, client
+    reuse and API error translation live in one place.
+    """
+    cached = _get_cached_response(prompt)
+    if cached is not None:
+        return _parse_json_response(cached)
+
+    import anthropic
+
+    client = _get_client()
     try:
         message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4096,
+            model=CLAUDE_MODEL,
+            max_tokens=max_tokens,
             messages=[{"role": "user", "content": prompt}],
         )
     except anthropic.APIConnectionError:
@@ -125,39 +196,27 @@ def extract_regattas(content: str, year: int) -> list[dict]:
         raise ConnectionError(f"Claude API error: {e.message}")
 
     raw = message.content[0].text.strip()
+    data = _parse_json_response(raw)
+    _cache_response(prompt, raw)
+    return data
 
-    # Strip markdown code fences if present
-    if raw.startswith("```"):
-        lines = raw.split("\n")
-        # Remove first line (```json) and last line (```)
-        lines = [ln for ln in lines[1:] if ln.strip() != "```"]
-        raw = "\n".join(lines)
 
-    try:
-        data = json.loads(raw)
-    except json.JSONDecodeError:
-        logger.error("Failed to parse Claude response as JSON: %s", raw[:500])
-        raise ValueError(
-            "Could not parse the AI response. Try again with clearer input."
-        )
-
-    if not isinstance(data, list):
-        raise ValueError("Unexpected AI response format.")
-
-    return data
+def extract_regattas(content: str, year: int) -> list[dict]:
+    """Send content to Claude API and return extracted regatta data."""
+    prompt = EXTRACTION_PROMPT.format(year=year, content=content)
+    return _call_claude(prompt, max_tokens=4096)
 
 
 def _parse_json_response(raw: str) -> list:
     """Parse a JSON array from a Claude response, stripping code fences."""
     text = raw.strip()
+    # The prompts ask for bare JSON, so fences are the exception
     if text.startswith("```"):
-        lines = text.split("\n")
-        lines = [ln for ln in lines[1:] if ln.strip() != "```"]
-        text = "\n".join(lines)
+        text = _CODE_FENCE_RE.sub("", text)
 
     try:
-        data = json.loads(text)
-    except json.JSONDecodeError:
+        data = orjson.loads(text)
+    except orjson.JSONDecodeError:
         logger.error("Failed to parse Claude response as JSON: %s", text[:500])
         raise ValueError(
             "Could not parse the AI response. Try again with clearer input."
@@ -171,63 +230,21 @@ def _parse_json_response(raw: str) -> list:
 
 def discover_documents(content: str, regatta_name: str, source_url: str) -> list[dict]:
     """Discover NOR/SI/WWW document links from a regatta detail page."""
-    api_key = current_app.config.get("ANTHROPIC_API_KEY")
-    if not api_key:
-        raise ValueError("ANTHROPIC_API_KEY is not configured.")
-
-    client = anthropic.Anthropic(api_key=api_key)
-
     prompt = DOCUMENT_DISCOVERY_PROMPT.format(
         regatta_name=regatta_name,
         source_url=source_url,
         content=content,
     )
-
-    try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1024,
-            messages=[{"role": "user", "content": prompt}],
-        )
-    except anthropic.APIConnectionError:
-        raise ConnectionError("Could not connect to the Claude API.")
-    except anthropic.RateLimitError:
-        raise ConnectionError("Claude API rate limit exceeded. Try again shortly.")
-    except anthropic.APIStatusError as e:
-        raise ConnectionError(f"Claude API error: {e.message}")
-
-    raw = message.content[0].text.strip()
-    return _parse_json_response(raw)
+    return _call_claude(prompt)
 
 
 def discover_documents_deep(
     content: str, regatta_name: str, source_url: str
 ) -> list[dict]:
     """Discover NOR/SI document links from a regatta website (level-2 crawl)."""
-    api_key = current_app.config.get("ANTHROPIC_API_KEY")
-    if not api_key:
-        raise ValueError("ANTHROPIC_API_KEY is not configured.")
-
-    client = anthropic.Anthropic(api_key=api_key)
-
     prompt = DOCUMENT_DEEP_DISCOVERY_PROMPT.format(
         regatta_name=regatta_name,
         source_url=source_url,
         content=content,
     )
-
-    try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1024,
-            messages=[{"role": "user", "content": prompt}],
-        )
-    except anthropic.APIConnectionError:
-        raise ConnectionError("Could not connect to the Claude API.")
-    except anthropic.RateLimitError:
-        raise ConnectionError("Claude API rate limit exceeded. Try again shortly.")
-    except anthropic.APIStatusError as e:
-        raise ConnectionError(f"Claude API error: {e.message}")
-
-    raw = message.content[0].text.strip()
-    return _parse_json_response(raw)
+    return _call_claude(prompt)
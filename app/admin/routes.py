@@ -1,32 +1,78 @@
 import ipaddress
 import json
 import logging
+import queue
 import re
+import time
 import uuid
-from datetime import date
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from socket import getaddrinfo
-from urllib.parse import quote_plus, urljoin, urlparse
+from urllib.parse import urljoin, urlparse
 
+import orjson
 import requests
 from bs4 import BeautifulSoup
-from flask import (Response, flash, redirect, render_template, request,
-                   stream_with_context, url_for)
+from flask import (Response, current_app, flash, redirect, render_template,
+                   request, stream_with_context, url_for)
 from flask_login import current_user, login_required
-from sqlalchemy import func
+from requests.adapters import HTTPAdapter
+from sqlalchemy import delete, func, lambda_stmt, select
 
 from app import db
 from app.admin import bp
 from app.admin.ai_service import (discover_documents, discover_documents_deep,
                                   extract_regattas)
-from app.models import Document, Regatta
+from app.models import Document, ImportResult, Regatta
 
 logger = logging.getLogger(__name__)
 
 MAX_CONTENT_LENGTH = 20_000
-
-# Temporary storage keyed by UUID task ID, cleaned up when consumed.
-_extraction_results: dict[str, dict] = {}
-_discovery_results: dict[str, dict] = {}
+# Bytes of a fetched page to download and parse. Leaves room for the markup
+# and scripts stripped out before the text is cut to MAX_CONTENT_LENGTH.
+MAX_FETCH_BYTES = MAX_CONTENT_LENGTH * 8
+# Non-HTML bodies aren't stripped, so just enough bytes for MAX_CONTENT_LENGTH
+# characters (UTF-8 is at most 4 bytes per character).
+MAX_TEXT_FETCH_BYTES = MAX_CONTENT_LENGTH * 4
+
+# Content types parsed as HTML; anything else is used as plain text
+_HTML_MIME_TYPES = frozenset({"text/html", "application/xhtml+xml"})
+
+# Page chrome removed before extracting plain text
+_STRIPPED_TAGS = ["script", "style", "nav", "footer", "header"]
+_TEXT_PASS_TAGS = _STRIPPED_TAGS + ["a"]
+
+# Per-row fields posted by the import preview and document review forms
+_REGATTA_FORM_FIELDS = (
+    "name",
+    "boat_class",
+    "location",
+    "location_url",
+    "start_date",
+    "end_date",
+    "notes",
+)
+_DISCOVER_FORM_FIELDS = _REGATTA_FORM_FIELDS + ("detail_url",)
+
+# Resolved addresses per hostname: {hostname: (expires_at, addresses)}
+DNS_CACHE_TTL = 60  # seconds
+DNS_CACHE_MAX_HOSTS = 256
+_dns_cache: dict[str, tuple[float, tuple[str, ...]]] = {}
+
+# Shared HTTP session so repeated fetches to the same host (clubspot, event
+# sites during discovery) reuse pooled keep-alive connections.
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "RaceCrewNetwork/1.0"})
+_http_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0)
+SESSION.mount("https://", _http_adapter)
+SESSION.mount("http://", _http_adapter)
+
+# Regattas whose documents are discovered concurrently
+DISCOVERY_WORKERS = 8
+
+# Seconds an unclaimed extraction/discovery result is kept
+IMPORT_RESULT_TTL = 600
 
 
 def _require_admin():
@@ -37,20 +83,97 @@ def _require_admin():
     return None
 
 
+def _save_import_result(task_id: str, kind: str, data) -> None:
+    """Store results for the preview page to pick up, dropping stale ones."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=IMPORT_RESULT_TTL)
+    db.session.execute(delete(ImportResult).where(ImportResult.created_at < cutoff))
+    db.session.add(
+        ImportResult(id=task_id, kind=kind, payload=orjson.dumps(data).decode())
+    )
+    db.session.commit()
+
+
+def _pop_import_result(task_id: str, kind: str):
+    """Remove and return stored results, or None if missing or expired."""
+    if not task_id:
+        return None
+    result = db.session.get(ImportResult, task_id)
+    if result is None or result.kind != kind:
+        return None
+    created_at = result.created_at.replace(tzinfo=timezone.utc)
+    payload = result.payload
+    db.session.delete(result)
+    db.session.commit()
+    if datetime.now(timezone.utc) - created_at > timedelta(seconds=IMPORT_RESULT_TTL):
+        return None
+    return orjson.loads(payload)
+
+
+def _sse(event: dict) -> bytes:
+    """Encode one server-sent event for the import progress streams."""
+    return b"data: " + orjson.dumps(event) + b"\n\n"
+
+
+def _form_row(form, idx: str, fields=_REGATTA_FORM_FIELDS) -> dict[str, str]:
+    """Read the stripped ``<field>_<idx>`` values of one preview-table row."""
+    return {field: form.get(f"{field}_{idx}", "").strip() for field in fields}
+
+
 def _find_duplicate(name: str, start_date) -> Regatta | None:
     """Find an existing regatta with the same name (case-insensitive) and start date."""
-    return Regatta.query.filter(
-        func.lower(Regatta.name) == name.lower(),
-        Regatta.start_date == start_date,
-    ).first()
+    lowered = name.lower()
+    # lambda_stmt caches the compiled SQL; only the bound values change per call
+    stmt = lambda_stmt(
+        lambda: select(Regatta)
+        .where(
+            func.lower(Regatta.name) == lowered,
+            Regatta.start_date == start_date,
+        )
+        .limit(1)
+    )
+    return db.session.scalars(stmt).first()
+
+
+def _find_duplicates(candidates: list[tuple[str, date]]) -> dict[tuple, Regatta]:
+    """Look up existing regattas for many (name, start date) pairs in one query.
+
+    Returns a dict keyed by (lowercased name, start date) so callers can
+    check each candidate without another round trip to the database.
+    """
+    if not candidates:
+        return {}
+    names = {name.lower() for name, _ in candidates}
+    start_dates = {start for _, start in candidates}
+    rows = Regatta.query.filter(
+        func.lower(Regatta.name).in_(names),
+        Regatta.start_date.in_(start_dates),
+    ).all()
+    return {(r.name.lower(), r.start_date): r for r in rows}
+
+
+def _resolve_host(hostname: str) -> tuple[str, ...]:
+    """Resolve a hostname to its IP addresses, cached for DNS_CACHE_TTL seconds.
+
+    Document discovery fetches many pages from the same few hosts, so this
+    saves a blocking DNS lookup on every fetch after the first.
+    """
+    now = time.monotonic()
+    cached = _dns_cache.get(hostname)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    addresses = tuple({sockaddr[0] for *_, sockaddr in getaddrinfo(hostname, None)})
+    if len(_dns_cache) >= DNS_CACHE_MAX_HOSTS:
+        _dns_cache.clear()
+    _dns_cache[hostname] = (now + DNS_CACHE_TTL, addresses)
+    return addresses
 
 
 def _is_private_ip(hostname: str) -> bool:
     """Check if a hostname resolves to a private/loopback IP (SSRF guard)."""
     try:
-        results = getaddrinfo(hostname, None)
-        for _, _, _, _, sockaddr in results:
-            ip = ipaddress.ip_address(sockaddr[0])
+        for address in _resolve_host(hostname):
+            ip = ipaddress.ip_address(address)
             if ip.is_private or ip.is_loopback or ip.is_reserved:
                 return True
     except Exception:
@@ -61,6 +184,14 @@ def _is_private_ip(hostname: str) -> bool:
 CLUBSPOT_PARSE_APP_ID = "myclubspot2017"
 CLUBSPOT_PARSE_URL = "https://theclubspot.com/parse/classes/documents"
 
+# Documents per clubspot regatta: {regatta_id: (expires_at, documents)}
+CLUBSPOT_CACHE_TTL = 60  # seconds
+CLUBSPOT_CACHE_MAX_ENTRIES = 256
+_clubspot_cache: dict[str, tuple[float, list[dict]]] = {}
+
+# Clubspot regatta page path: /regatta/<id> or /regatta/<id>/...
+_CLUBSPOT_ID_RE = re.compile(r"^/regatta/([A-Za-z0-9]+)")
+
 # Map clubspot document types to our doc_type codes
 _CLUBSPOT_DOC_TYPES = {
     "nor": ("NOR", "Notice of Race"),
@@ -69,7 +200,17 @@ _CLUBSPOT_DOC_TYPES = {
 
 
 def _fetch_clubspot_documents(regatta_id: str) -> list[dict]:
-    """Query the clubspot Parse API for NOR/SI documents."""
+    """Query the clubspot Parse API for NOR/SI documents.
+
+    Results are cached for CLUBSPOT_CACHE_TTL seconds, since one discovery
+    batch can reach the same clubspot regatta from several pages.
+    """
+    now = time.monotonic()
+    cached = _clubspot_cache.get(regatta_id)
+    if cached and cached[0] > now:
+        # Callers append to the list, so hand out copies
+        return [dict(doc) for doc in cached[1]]
+
     where = json.dumps(
         {
             "regattaObject": {
@@ -82,13 +223,10 @@ def _fetch_clubspot_documents(regatta_id: str) -> list[dict]:
         }
     )
     try:
-        resp = requests.get(
+        resp = SESSION.get(
             CLUBSPOT_PARSE_URL,
             params={"where": where},
-            headers={
-                "X-Parse-Application-Id": CLUBSPOT_PARSE_APP_ID,
-                "User-Agent": "RaceCrewNetwork/1.0",
-            },
+            headers={"X-Parse-Application-Id": CLUBSPOT_PARSE_APP_ID},
             timeout=15,
         )
         resp.raise_for_status()
@@ -104,7 +242,11 @@ def _fetch_clubspot_documents(regatta_id: str) -> list[dict]:
         if doc_type_key in _CLUBSPOT_DOC_TYPES and url:
             code, label = _CLUBSPOT_DOC_TYPES[doc_type_key]
             docs.append({"doc_type": code, "url": url, "label": label})
-    return docs
+
+    if len(_clubspot_cache) >= CLUBSPOT_CACHE_MAX_ENTRIES:
+        _clubspot_cache.clear()
+    _clubspot_cache[regatta_id] = (now + CLUBSPOT_CACHE_TTL, docs)
+    return [dict(doc) for doc in docs]
 
 
 def _parse_clubspot_regatta_id(url: str) -> str | None:
@@ -112,8 +254,7 @@ def _parse_clubspot_regatta_id(url: str) -> str | None:
     parsed = urlparse(url)
     if "theclubspot.com" not in (parsed.hostname or ""):
         return None
-    # URL pattern: /regatta/<id> or /regatta/<id>/...
-    match = re.match(r"^/regatta/([A-Za-z0-9]+)", parsed.path)
+    match = _CLUBSPOT_ID_RE.match(parsed.path)
     return match.group(1) if match else None
 
 
@@ -126,34 +267,52 @@ def _extract_data_attributes(soup: BeautifulSoup) -> str:
     """
     results = []
     # Check body and top-level containers for data attributes with JSON
-    candidates = [soup.body] if soup.body else []
+    body = soup.body
+    candidates = [body] if body is not None else []
     candidates.extend(soup.find_all("div", attrs={"data-regatta": True}))
 
     for tag in candidates:
-        if tag is None:
-            continue
         for attr_name, attr_value in tag.attrs.items():
+            # data-* values are always plain strings (never multi-valued);
+            # only process ones that look like JSON objects/arrays
             if not attr_name.startswith("data-"):
                 continue
-            # Only process attributes that look like JSON objects/arrays
-            val = attr_value if isinstance(attr_value, str) else str(attr_value)
-            val = val.strip()
-            if not (val.startswith("{") or val.startswith("[")):
+            val = attr_value.strip()
+            if not val.startswith(("{", "[")):
                 continue
             try:
-                data = json.loads(val)
-            except (json.JSONDecodeError, ValueError):
+                data = orjson.loads(val)
+            except orjson.JSONDecodeError:
                 continue
             # Flatten to a readable summary for the AI
-            results.append(f"Embedded data ({attr_name}): {json.dumps(data)}")
+            results.append(
+                f"Embedded data ({attr_name}): {orjson.dumps(data).decode()}"
+            )
 
     if not results:
         return ""
     return "Structured data from page attributes:\n" + "\n".join(results)
 
 
-def _fetch_url_content(url: str) -> str:
-    """Fetch a URL and return plain text content."""
+def _read_limited(resp: requests.Response, limit: int) -> bytes:
+    """Read at most ``limit`` bytes from a streamed response body."""
+    chunks = []
+    total = 0
+    for chunk in resp.iter_content(chunk_size=16384):
+        chunks.append(chunk)
+        total += len(chunk)
+        if total >= limit:
+            break
+    return b"".join(chunks)[:limit]
+
+
+def _fetch_url_content(url: str, structured_only: bool = False) -> str:
+    """Fetch a URL and return plain text content.
+
+    With ``structured_only``, a page whose JSON-LD fully describes its events
+    (each has a name and start date) returns just that structured data,
+    skipping page text extraction and keeping the AI prompt small.
+    """
     parsed = urlparse(url)
     if not parsed.scheme or not parsed.hostname:
         raise ValueError("Invalid URL.")
@@ -162,33 +321,57 @@ def _fetch_url_content(url: str) -> str:
     if _is_private_ip(parsed.hostname):
         raise ValueError("URLs pointing to private networks are not allowed.")
 
-    resp = requests.get(url, timeout=15, headers={"User-Agent": "RaceCrewNetwork/1.0"})
-    resp.raise_for_status()
-
-    content_type = resp.headers.get("Content-Type", "")
-    if "html" in content_type:
-        soup = BeautifulSoup(resp.text, "html.parser")
+    resp = SESSION.get(url, timeout=15, stream=True)
+    try:
+        resp.raise_for_status()
+        # Non-HTML bodies are used as-is, so only read what survives the cut
+        mime = resp.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+        is_html = mime in _HTML_MIME_TYPES
+        body = _read_limited(resp, MAX_FETCH_BYTES if is_html else MAX_TEXT_FETCH_BYTES)
+    finally:
+        resp.close()
+    page = body.decode(resp.encoding or "utf-8", errors="replace")
+
+    if is_html:
+        # Keep class/rel/etc. as plain strings: we never read them as lists,
+        # and skipping the split saves a list allocation per tag.
+        soup = BeautifulSoup(page, "lxml", multi_valued_attributes=None)
 
         # Extract JSON-LD structured data (schema.org Events)
-        jsonld_events = _extract_jsonld_events(resp.text)
+        events = _extract_jsonld_events(soup)
+        jsonld_events = _summarize_jsonld_events(events)
 
         # Extract JSON from data attributes (Vue/React hydration data)
         data_attr_text = _extract_data_attributes(soup)
 
-        # Remove scripts and styles for plain text extraction
-        for tag in soup(["script", "style", "nav", "footer", "header"]):
-            tag.decompose()
-
-        # Preserve link URLs so AI can see them in plain text
-        for a_tag in soup.find_all("a", href=True):
-            href = a_tag["href"]
-            # Resolve relative URLs to absolute
+        if (
+            structured_only
+            and events
+            and all(ev.get("name") and ev.get("startDate") for ev in events)
+        ):
+            parts = [jsonld_events]
+            if data_attr_text:
+                parts.append(data_attr_text)
+            return "\n\n".join(parts)[:MAX_CONTENT_LENGTH]
+
+        # One walk over the tree: drop page chrome and, so the AI can see
+        # link URLs in plain text, rewrite links as "text [absolute url]".
+        # Tags inside already-removed chrome are skipped.
+        for tag in soup.find_all(_TEXT_PASS_TAGS):
+            if tag.decomposed:
+                continue
+            if tag.name != "a":
+                tag.decompose()
+                continue
+            href = tag.get("href")
+            if href is None:
+                continue
             abs_url = urljoin(url, href)
-            link_text = a_tag.get_text(strip=True)
+            link_text = tag.get_text(strip=True)
             if link_text:
-                a_tag.replace_with(f"{link_text} [{abs_url}]")
+                tag.replace_with(f"{link_text} [{abs_url}]")
             else:
-                a_tag.replace_with(f"[{abs_url}]")
+                tag.replace_with(f"[{abs_url}]")
 
         text = soup.get_text(separator="\n", strip=True)
 
@@ -201,49 +384,68 @@ def _fetch_url_content(url: str) -> str:
         if prefix_parts:
             text = "\n\n".join(prefix_parts) + "\n\n" + text
     else:
-        text = resp.text
+        text = page
 
     return text[:MAX_CONTENT_LENGTH]
 
 
-def _extract_jsonld_events(html: str) -> str:
-    """Extract schema.org Event data from JSON-LD script tags."""
-    blocks = re.findall(
-        r'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>',
-        html,
-        re.DOTALL,
-    )
+def _extract_jsonld_events(soup: BeautifulSoup) -> list[dict]:
+    """Extract schema.org Events from JSON-LD script tags."""
     events = []
-    for block in blocks:
+    for script in soup.find_all("script", type="application/ld+json"):
         try:
-            data = json.loads(block)
-        except (json.JSONDecodeError, ValueError):
+            data = orjson.loads(script.get_text())
+        except orjson.JSONDecodeError:
             continue
+        events.extend(_walk_jsonld_events(data))
+    return events
 
-        items = data if isinstance(data, list) else [data]
-        for item in items:
-            if item.get("@type") == "Event":
-                events.append(item)
-            # Handle @graph wrapper
-            if "@graph" in item:
-                for node in item["@graph"]:
-                    if node.get("@type") == "Event":
-                        events.append(node)
 
+def _summarize_jsonld_events(events: list[dict]) -> str:
+    """Summarize JSON-LD Events for the AI, one line per event."""
     if not events:
         return ""
 
-    lines = ["Structured event data found on page:"]
-    for ev in events:
-        loc = ev.get("location", {})
-        loc_name = loc.get("name", "") if isinstance(loc, dict) else ""
-        lines.append(
-            f"- {ev.get('name', 'Unknown')}"
-            f" | {ev.get('startDate', '')}"
-            f" - {ev.get('endDate', '')}"
-            f" | {loc_name}"
-        )
-    return "\n".join(lines)
+    return "\n".join(
+        [
+            "Structured event data found on page:",
+            *(_format_jsonld_event(ev) for ev in events),
+        ]
+    )
+
+
+def _walk_jsonld_events(node):
+    """Yield every schema.org Event in a JSON-LD document, in document order.
+
+    Walks lists and @graph wrappers (at any depth) with an explicit stack.
+    """
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(reversed(item))
+        elif isinstance(item, dict):
+            if item.get("@type") == "Event":
+                yield item
+            graph = item.get("@graph")
+            if graph is not None:
+                stack.append(graph)
+
+
+def _format_jsonld_event(ev: dict) -> str:
+    """Format one JSON-LD Event as a single summary line for the AI."""
+    loc = ev.get("location", {})
+    loc_name = loc.get("name", "") if isinstance(loc, dict) else ""
+    line = (
+        f"- {ev.get('name', 'Unknown')}"
+        f" | {ev.get('startDate', '')}"
+        f" - {ev.get('endDate', '')}"
+        f" | {loc_name}"
+    )
+    url = ev.get("url")
+    if isinstance(url, str) and url:
+        line += f" | {url}"
+    return line
 
 
 @bp.route("/admin/import-schedule")
@@ -290,20 +492,17 @@ def import_schedule_extract():
 
     schedule_text = request.form.get("schedule_text", "").strip()
     schedule_url = request.form.get("schedule_url", "").strip()
-    current_year = date.today().year
-    year = int(request.form.get("year", current_year))
+    today = date.today()
+    year = request.form.get("year", today.year, type=int)
     task_id = str(uuid.uuid4())
 
-    def _sse(event: dict) -> str:
-        return f"data: {json.dumps(event)}\n\n"
-
     def generate():
         content = schedule_text
 
         if schedule_url:
             yield _sse({"type": "progress", "message": f"Fetching {schedule_url}..."})
             try:
-                content = _fetch_url_content(schedule_url)
+                content = _fetch_url_content(schedule_url, structured_only=True)
             except (ValueError, requests.RequestException) as e:
                 yield _sse({"type": "error", "message": f"Could not fetch URL: {e}"})
                 yield _sse({"type": "failed"})
@@ -337,13 +536,18 @@ def import_schedule_extract():
         if schedule_url and len(regattas) == 1 and not regattas[0].get("detail_url"):
             regattas[0]["detail_url"] = schedule_url
 
-        # Mark past events
-        today = date.today().isoformat()
+        # Mark past events and collect duplicate-check candidates in one pass
+        today_iso = today.isoformat()
         past_count = 0
+        candidates = []
         for r in regattas:
-            if (r.get("start_date") or "") < today:
+            start = r.get("start_date") or ""
+            if start < today_iso:
                 r["is_past"] = True
                 past_count += 1
+            name = r.get("name")
+            if name and start:
+                candidates.append((r, name, date.fromisoformat(start)))
 
         if past_count:
             yield _sse(
@@ -358,21 +562,19 @@ def import_schedule_extract():
             yield _sse({"type": "failed"})
             return
 
-        # Check for duplicates
+        # Check for duplicates (one query for the whole batch)
+        existing_by_key = _find_duplicates([(n, d) for _, n, d in candidates])
         dup_count = 0
-        for r in regattas:
-            start = r.get("start_date")
-            name = r.get("name")
-            if name and start:
-                existing = _find_duplicate(name, date.fromisoformat(start))
-                if existing:
-                    dup_count += 1
-                    r["duplicate_of"] = {
-                        "id": existing.id,
-                        "name": existing.name,
-                        "location": existing.location,
-                        "start_date": existing.start_date.isoformat(),
-                    }
+        for r, name, start in candidates:
+            existing = existing_by_key.get((name.lower(), start))
+            if existing:
+                dup_count += 1
+                r["duplicate_of"] = {
+                    "id": existing.id,
+                    "name": existing.name,
+                    "location": existing.location,
+                    "start_date": existing.start_date.isoformat(),
+                }
 
         if dup_count:
             yield _sse(
@@ -382,10 +584,7 @@ def import_schedule_extract():
                 }
             )
 
-        _extraction_results[task_id] = {
-            "regattas": regattas,
-            "year": year,
-        }
+        _save_import_result(task_id, "schedule", {"regattas": regattas, "year": year})
 
         upcoming = len(regattas) - past_count
         summary = f"Found {len(regattas)} regatta(s)"
@@ -412,13 +611,10 @@ def import_schedule_extract_single():
         return denied
 
     schedule_url = request.form.get("schedule_url", "").strip()
-    current_year = date.today().year
-    year = int(request.form.get("year", current_year))
+    today = date.today()
+    year = request.form.get("year", today.year, type=int)
     task_id = str(uuid.uuid4())
 
-    def _sse(event: dict) -> str:
-        return f"data: {json.dumps(event)}\n\n"
-
     def generate():
         if not schedule_url:
             yield _sse({"type": "error", "message": "Provide a regatta URL."})
@@ -473,10 +669,7 @@ def import_schedule_extract_single():
                     }
                 )
 
-        _extraction_results[task_id] = {
-            "regatta": r,
-            "year": year,
-        }
+        _save_import_result(task_id, "single", {"regatta": r, "year": year})
 
         summary = r.get("name", "Regatta")
         yield _sse({"type": "done", "task_id": task_id, "summary": summary})
@@ -499,12 +692,11 @@ def import_single_preview():
     if denied:
         return denied
 
-    task_id = request.args.get("task_id", "")
-    if not task_id or task_id not in _extraction_results:
+    data = _pop_import_result(request.args.get("task_id", ""), "single")
+    if data is None:
         flash("Extraction results not found or expired.", "error")
         return redirect(url_for("admin.import_single"))
 
-    data = _extraction_results.pop(task_id)
     return render_template(
         "admin/import_single_preview.html",
         regatta=data["regatta"],
@@ -519,12 +711,11 @@ def import_schedule_preview():
     if denied:
         return denied
 
-    task_id = request.args.get("task_id", "")
-    if not task_id or task_id not in _extraction_results:
+    data = _pop_import_result(request.args.get("task_id", ""), "schedule")
+    if data is None:
         flash("Extraction results not found or expired.", "error")
         return redirect(url_for("admin.import_multiple"))
 
-    data = _extraction_results.pop(task_id)
     # Determine start_over_url from source (default to multiple)
     start_over_url = request.args.get(
         "start_over_url", url_for("admin.import_multiple")
@@ -555,14 +746,13 @@ def import_schedule_confirm():
     skipped = 0
     docs_created = 0
 
+    form = request.form
+    rows = []
     for idx in selected:
-        name = request.form.get(f"name_{idx}", "").strip()
-        boat_class = request.form.get(f"boat_class_{idx}", "").strip() or "TBD"
-        location = request.form.get(f"location_{idx}", "").strip()
-        location_url = request.form.get(f"location_url_{idx}", "").strip()
-        start_date_str = request.form.get(f"start_date_{idx}", "").strip()
-        end_date_str = request.form.get(f"end_date_{idx}", "").strip()
-        notes = request.form.get(f"notes_{idx}", "").strip()
+        row = _form_row(form, idx)
+        name = row["name"]
+        start_date_str = row["start_date"]
+        end_date_str = row["end_date"]
 
         if not name or not start_date_str:
             skipped += 1
@@ -579,15 +769,22 @@ def import_schedule_confirm():
             skipped += 1
             continue
 
-        # Duplicate check: case-insensitive name + start_date
-        existing = _find_duplicate(name, start_date)
-        if existing:
+        rows.append((idx, row, start_date, end_date))
+
+    # Duplicate check: case-insensitive name + start_date, one query for all rows
+    existing_by_key = _find_duplicates([(r["name"], start) for _, r, start, _ in rows])
+
+    for idx, row, start_date, end_date in rows:
+        name = row["name"]
+        key = (name.lower(), start_date)
+        if key in existing_by_key:
             skipped += 1
             continue
 
-        # Auto-generate Google Maps link if no location_url
-        if not location_url and location:
-            location_url = f"https://www.google.com/maps/search/{quote_plus(location)}"
+        boat_class = row["boat_class"] or "TBD"
+        location = row["location"]
+        location_url = row["location_url"]
+        notes = row["notes"]
 
         regatta = Regatta(
             name=name,
@@ -600,32 +797,34 @@ def import_schedule_confirm():
             created_by=current_user.id,
         )
         db.session.add(regatta)
+        # Later rows with the same name and date are duplicates of this one
+        existing_by_key[key] = regatta
         created += 1
 
         # Create associated documents if present
-        doc_count_str = request.form.get(f"doc_count_{idx}", "0")
+        doc_count_str = form.get(f"doc_count_{idx}", "0")
         try:
             doc_count = int(doc_count_str)
         except ValueError:
             doc_count = 0
 
-        if doc_count > 0:
-            db.session.flush()  # Get regatta.id
-            for d_idx in range(doc_count):
-                checkbox = request.form.get(f"doc_{idx}_{d_idx}")
-                if not checkbox:
-                    continue
-                doc_type = request.form.get(f"doc_type_{idx}_{d_idx}", "").strip()
-                doc_url = request.form.get(f"doc_url_{idx}_{d_idx}", "").strip()
-                if doc_type and doc_url:
-                    doc = Document(
-                        regatta_id=regatta.id,
-                        doc_type=doc_type,
-                        url=doc_url,
-                        uploaded_by=current_user.id,
-                    )
-                    db.session.add(doc)
-                    docs_created += 1
+        for d_idx in range(doc_count):
+            checkbox = form.get(f"doc_{idx}_{d_idx}")
+            if not checkbox:
+                continue
+            doc_type = form.get(f"doc_type_{idx}_{d_idx}", "").strip()
+            doc_url = form.get(f"doc_url_{idx}_{d_idx}", "").strip()
+            if doc_type and doc_url:
+                # Linking via the relationship lets the whole batch be
+                # inserted at commit instead of flushing per regatta.
+                doc = Document(
+                    regatta=regatta,
+                    doc_type=doc_type,
+                    url=doc_url,
+                    uploaded_by=current_user.id,
+                )
+                db.session.add(doc)
+                docs_created += 1
 
     db.session.commit()
 
@@ -640,6 +839,100 @@ def import_schedule_confirm():
     return redirect(url_for("regattas.index"))
 
 
+def _discover_regatta_documents(r: dict, emit: Callable[[dict], None]) -> None:
+    """Find NOR/SI/WWW documents for one regatta selected for import.
+
+    Fills in ``r["documents"]`` (or ``r["error"]``), passing progress events
+    to ``emit`` as it goes. Several regattas are discovered at once, so
+    follow-up messages start with the regatta's name. Needs an app context
+    for the AI calls.
+    """
+    name = r["name"]
+    emit({"type": "progress", "message": f"Fetching: {name}..."})
+
+    try:
+        # Clubspot detail URL: query Parse API directly
+        cs_id = _parse_clubspot_regatta_id(r["detail_url"])
+        if cs_id:
+            docs = _fetch_clubspot_documents(cs_id)
+            # Add the clubspot page itself as WWW
+            docs.append(
+                {
+                    "doc_type": "WWW",
+                    "url": r["detail_url"],
+                    "label": "Regatta website",
+                }
+            )
+        else:
+            content = _fetch_url_content(r["detail_url"])
+            docs = discover_documents(content, name, r["detail_url"])
+
+        r["documents"] = docs
+
+        if docs:
+            doc_types = ", ".join(d["doc_type"] for d in docs)
+            emit({"type": "result", "message": f"{name}: Found: {doc_types}"})
+        else:
+            emit({"type": "result", "message": f"{name}: No documents found"})
+
+        # Level 2: check WWW links for NOR/SI (skip if
+        # we already used a direct API like clubspot)
+        www_docs = [d for d in docs if d["doc_type"] == "WWW" and not cs_id]
+        existing_types = {d["doc_type"] for d in docs}
+        for www_doc in www_docs:
+            # Skip if we already found both NOR and SI
+            if "NOR" in existing_types and "SI" in existing_types:
+                break
+
+            www_url = www_doc["url"]
+            emit(
+                {
+                    "type": "progress",
+                    "message": f"{name}: Checking regatta website for documents...",
+                }
+            )
+
+            try:
+                # Clubspot: query Parse API directly
+                cs_id = _parse_clubspot_regatta_id(www_url)
+                if cs_id:
+                    deep_docs = _fetch_clubspot_documents(cs_id)
+                else:
+                    www_content = _fetch_url_content(www_url)
+                    deep_docs = discover_documents_deep(www_content, name, www_url)
+
+                # Only add doc types we don't already have
+                new_docs = [d for d in deep_docs if d["doc_type"] not in existing_types]
+                if new_docs:
+                    r["documents"].extend(new_docs)
+                    existing_types.update(d["doc_type"] for d in new_docs)
+                    deep_types = ", ".join(d["doc_type"] for d in new_docs)
+                    message = f"{name}: Found on regatta website: {deep_types}"
+                    emit({"type": "result", "message": message})
+                else:
+                    emit(
+                        {
+                            "type": "result",
+                            "message": f"{name}: No additional documents found",
+                        }
+                    )
+            except Exception as e:
+                logger.warning("Level-2 crawl failed for %s: %s", www_url, e)
+                emit(
+                    {
+                        "type": "result",
+                        "message": f"{name}: Could not check regatta website",
+                    }
+                )
+
+    except (ValueError, requests.RequestException) as e:
+        r["error"] = str(e)
+        emit({"type": "error", "message": f"{name}: Could not fetch page: {e}"})
+    except (ConnectionError, Exception) as e:
+        r["error"] = str(e)
+        emit({"type": "error", "message": f"{name}: Error: {e}"})
+
+
 @bp.route("/admin/import-schedule/discover", methods=["POST"])
 @login_required
 def import_schedule_discover():
@@ -651,41 +944,37 @@ def import_schedule_discover():
     task_id = str(uuid.uuid4())
 
     # Collect regatta data from the form
+    form = request.form
     regatta_data = []
     for idx in selected:
-        regatta_data.append(
-            {
-                "idx": idx,
-                "name": request.form.get(f"name_{idx}", "").strip(),
-                "boat_class": request.form.get(f"boat_class_{idx}", "").strip()
-                or "TBD",
-                "location": request.form.get(f"location_{idx}", "").strip(),
-                "location_url": request.form.get(f"location_url_{idx}", "").strip(),
-                "start_date": request.form.get(f"start_date_{idx}", "").strip(),
-                "end_date": request.form.get(f"end_date_{idx}", "").strip(),
-                "notes": request.form.get(f"notes_{idx}", "").strip(),
-                "detail_url": request.form.get(f"detail_url_{idx}", "").strip(),
-                "documents": [],
-                "error": None,
-            }
-        )
+        row = _form_row(form, idx, _DISCOVER_FORM_FIELDS)
+        row["boat_class"] = row["boat_class"] or "TBD"
+        row.update(idx=idx, documents=[], error=None)
+        regatta_data.append(row)
 
     if not regatta_data:
-        msg = json.dumps({"type": "error", "message": "No regattas selected."})
         return Response(
-            f"data: {msg}\n\n",
+            _sse({"type": "error", "message": "No regattas selected."}),
             content_type="text/event-stream",
         )
 
     # Check if any regattas have detail URLs
     has_detail_urls = any(r["detail_url"] for r in regatta_data)
 
-    def _sse(event: dict) -> str:
-        return f"data: {json.dumps(event)}\n\n"
+    app = current_app._get_current_object()
 
-    def generate():
-        total_docs = 0
+    # Workers queue their progress events as they happen, then None when done
+    events: queue.Queue[dict | None] = queue.Queue()
 
+    def _discover_in_app(r: dict) -> None:
+        try:
+            # Worker threads don't inherit the request's app context
+            with app.app_context():
+                _discover_regatta_documents(r, events.put)
+        finally:
+            events.put(None)
+
+    def generate():
         if not has_detail_urls:
             yield _sse(
                 {
@@ -695,139 +984,38 @@ def import_schedule_discover():
             )
         else:
             for r in regatta_data:
-                name = r["name"]
                 if not r["detail_url"]:
                     yield _sse(
                         {
                             "type": "progress",
-                            "message": f"Skipping {name} — no detail URL",
+                            "message": f"Skipping {r['name']} — no detail URL",
                         }
                     )
-                    continue
-
-                yield _sse({"type": "progress", "message": f"Fetching: {name}..."})
-
-                try:
-                    # Clubspot detail URL: query Parse API directly
-                    cs_id = _parse_clubspot_regatta_id(r["detail_url"])
-                    if cs_id:
-                        docs = _fetch_clubspot_documents(cs_id)
-                        # Add the clubspot page itself as WWW
-                        docs.append(
-                            {
-                                "doc_type": "WWW",
-                                "url": r["detail_url"],
-                                "label": "Regatta website",
-                            }
-                        )
-                    else:
-                        content = _fetch_url_content(r["detail_url"])
-                        docs = discover_documents(content, name, r["detail_url"])
-
-                    r["documents"] = docs
-                    total_docs += len(docs)
-
-                    if docs:
-                        doc_types = ", ".join(d["doc_type"] for d in docs)
-                        yield _sse(
-                            {
-                                "type": "result",
-                                "message": f"Found: {doc_types}",
-                            }
-                        )
+
+            # Each regatta is a handful of blocking fetches and AI calls, so
+            # run them side by side, streaming events while they run.
+            with ThreadPoolExecutor(max_workers=DISCOVERY_WORKERS) as pool:
+                futures = [
+                    pool.submit(_discover_in_app, r)
+                    for r in regatta_data
+                    if r["detail_url"]
+                ]
+                running = len(futures)
+                while running:
+                    event = events.get()
+                    if event is None:
+                        running -= 1
                     else:
-                        yield _sse(
-                            {
-                                "type": "result",
-                                "message": "No documents found",
-                            }
-                        )
-
-                    # Level 2: check WWW links for NOR/SI (skip if
-                    # we already used a direct API like clubspot)
-                    www_docs = [d for d in docs if d["doc_type"] == "WWW" and not cs_id]
-                    existing_types = {d["doc_type"] for d in docs}
-                    for www_doc in www_docs:
-                        # Skip if we already found both NOR and SI
-                        if "NOR" in existing_types and "SI" in existing_types:
-                            break
-
-                        www_url = www_doc["url"]
-                        yield _sse(
-                            {
-                                "type": "progress",
-                                "message": (
-                                    "Checking regatta website for documents..."
-                                ),
-                            }
-                        )
-
-                        try:
-                            # Clubspot: query Parse API directly
-                            cs_id = _parse_clubspot_regatta_id(www_url)
-                            if cs_id:
-                                deep_docs = _fetch_clubspot_documents(cs_id)
-                            else:
-                                www_content = _fetch_url_content(www_url)
-                                deep_docs = discover_documents_deep(
-                                    www_content, name, www_url
-                                )
-
-                            # Only add doc types we don't already have
-                            new_docs = [
-                                d
-                                for d in deep_docs
-                                if d["doc_type"] not in existing_types
-                            ]
-                            if new_docs:
-                                r["documents"].extend(new_docs)
-                                total_docs += len(new_docs)
-                                existing_types.update(d["doc_type"] for d in new_docs)
-                                deep_types = ", ".join(d["doc_type"] for d in new_docs)
-                                yield _sse(
-                                    {
-                                        "type": "result",
-                                        "message": (
-                                            "Found on regatta website:" f" {deep_types}"
-                                        ),
-                                    }
-                                )
-                            else:
-                                yield _sse(
-                                    {
-                                        "type": "result",
-                                        "message": ("No additional documents found"),
-                                    }
-                                )
-                        except Exception as e:
-                            logger.warning(
-                                "Level-2 crawl failed for %s: %s",
-                                www_url,
-                                e,
-                            )
-                            yield _sse(
-                                {
-                                    "type": "result",
-                                    "message": ("Could not check regatta website"),
-                                }
-                            )
-
-                except (ValueError, requests.RequestException) as e:
-                    r["error"] = str(e)
-                    yield _sse(
-                        {
-                            "type": "error",
-                            "message": f"Could not fetch page: {e}",
-                        }
-                    )
-                except (ConnectionError, Exception) as e:
-                    r["error"] = str(e)
-                    yield _sse({"type": "error", "message": f"Error: {e}"})
+                        yield _sse(event)
+                for future in futures:
+                    future.result()
+
+        total_docs = sum(len(r["documents"]) for r in regatta_data)
 
         for r in regatta_data:
             r["documents"].sort(key=lambda d: d["doc_type"])
 
-        _discovery_results[task_id] = regatta_data
+        _save_import_result(task_id, "discovery", regatta_data)
 
         regattas_with_docs = sum(1 for r in regatta_data if r["documents"])
         summary = (
@@ -852,12 +1040,11 @@ def import_schedule_documents():
     if denied:
         return denied
 
-    task_id = request.args.get("task_id", "")
-    if not task_id or task_id not in _discovery_results:
+    regatta_data = _pop_import_result(request.args.get("task_id", ""), "discovery")
+    if regatta_data is None:
         flash("Document discovery results not found or expired.", "error")
         return redirect(url_for("admin.import_multiple"))
 
-    regatta_data = _discovery_results.pop(task_id)
     start_over_url = request.args.get(
         "start_over_url", url_for("admin.import_multiple")
     )
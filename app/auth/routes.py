@@ -1,11 +1,27 @@
 from flask import flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required, login_user, logout_user
+from sqlalchemy.exc import IntegrityError
 
 from app import db
 from app.auth import bp
 from app.models import User
 
 
+def _commit_unique_email(message: str = "That email is already in use.") -> bool:
+    """Commit, flashing *message* if the email belongs to another user.
+
+    The unique index on users.email does the check as part of the write,
+    instead of a SELECT beforehand that another request could race.
+    """
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        flash(message, "error")
+        return False
+    return True
+
+
 @bp.route("/login", methods=["GET", "POST"])
 def login():
     if current_user.is_authenticated:
@@ -17,6 +33,10 @@ def login():
         user = User.query.filter_by(email=email).first()
 
         if user and user.invite_token is None and user.check_password(password):
+            # Bring old hashes to the configured cost while we have the password
+            if user.password_needs_rehash():
+                user.set_password(password)
+                db.session.commit()
             login_user(user)
             next_page = request.args.get("next")
             return redirect(next_page or url_for("regattas.index"))
@@ -78,8 +98,6 @@ def profile():
             flash("Name, initials, and email are required.", "error")
         elif len(initials) < 2 or len(initials) > 3:
             flash("Initials must be 2-3 characters.", "error")
-        elif email != current_user.email and User.query.filter_by(email=email).first():
-            flash("That email is already in use.", "error")
         elif password and len(password) < 6:
             flash("Password must be at least 6 characters.", "error")
         elif password and password != password2:
@@ -91,9 +109,9 @@ def profile():
             current_user.phone = request.form.get("phone", "").strip() or None
             if password:
                 current_user.set_password(password)
-            db.session.commit()
-            flash("Profile updated.", "success")
-            return redirect(url_for("auth.profile"))
+            if _commit_unique_email():
+                flash("Profile updated.", "success")
+                return redirect(url_for("auth.profile"))
 
     return render_template("profile.html")
 
@@ -115,7 +133,8 @@ def admin_users():
         flash("Access denied.", "error")
         return redirect(url_for("regattas.index"))
 
-    users = User.query.order_by(User.display_name).all()
+    # A club's worth of users; sorting them here is cheaper than a DB filesort
+    users = sorted(User.query.all(), key=lambda u: u.display_name.casefold())
     return render_template("admin_users.html", users=users)
 
 
@@ -133,10 +152,6 @@ def invite_user():
         flash("Email is required.", "error")
         return redirect(url_for("auth.admin_users"))
 
-    if User.query.filter_by(email=email).first():
-        flash("A user with that email already exists.", "error")
-        return redirect(url_for("auth.admin_users"))
-
     token = secrets.token_urlsafe(32)
     user = User(
         email=email,
@@ -146,7 +161,8 @@ def invite_user():
         invite_token=token,
     )
     db.session.add(user)
-    db.session.commit()
+    if not _commit_unique_email("A user with that email already exists."):
+        return redirect(url_for("auth.admin_users"))
 
     invite_url = url_for("auth.register", token=token, _external=True)
     flash(f"Invite link: {invite_url}", "success")
@@ -176,8 +192,6 @@ def edit_user(user_id: int):
             flash("Name, initials, and email are required.", "error")
         elif len(initials) < 2 or len(initials) > 3:
             flash("Initials must be 2-3 characters.", "error")
-        elif email != user.email and User.query.filter_by(email=email).first():
-            flash("That email is already in use.", "error")
         elif password and len(password) < 6:
             flash("Password must be at least 6 characters.", "error")
         else:
@@ -188,9 +202,9 @@ def edit_user(user_id: int):
             user.phone = request.form.get("phone", "").strip() or None
             if password:
                 user.set_password(password)
-            db.session.commit()
-            flash(f"User '{display_name}' updated.", "success")
-            return redirect(url_for("auth.admin_users"))
+            if _commit_unique_email():
+                flash(f"User '{display_name}' updated.", "success")
+                return redirect(url_for("auth.admin_users"))
 
     return render_template("edit_user.html", user=user)
 
@@ -1,15 +1,43 @@
+import hashlib
 import secrets
+from collections import defaultdict
 from datetime import timedelta
 
-from flask import Response, flash, redirect, url_for
+from flask import Response, flash, redirect, request, url_for
 from flask_login import current_user, login_required
-from icalendar import Calendar, Event
 from markupsafe import Markup
+from sqlalchemy import func, select
+from sqlalchemy.orm import raiseload, undefer
 
 from app import db
 from app.calendar import bp
 from app.models import RSVP, Regatta, User
 
+# Last rendered feed per subscriber: {user_id: (etag, ics bytes)}
+FEED_CACHE_MAX_USERS = 256
+_feed_cache: dict[int, tuple[str, bytes]] = {}
+# Seconds a calendar client may reuse the feed without asking again
+FEED_MAX_AGE = 300
+
+# Regatta rows fetched per round trip while rendering a feed
+FEED_REGATTA_BATCH = 200
+
+# RSVP status as shown in event descriptions
+STATUS_LABELS = {"yes": "Yes", "no": "No", "maybe": "Maybe"}
+
+_CALENDAR_HEADER = (
+    "BEGIN:VCALENDAR",
+    "PRODID:-//Race Crew Network//EN",
+    "VERSION:2.0",
+    "CALSCALE:GREGORIAN",
+    "X-WR-CALNAME:Race Crew Network",
+    "METHOD:PUBLISH",
+)
+# Backslash, semicolon, comma and newline must be escaped in TEXT values
+_ICAL_TEXT_ESCAPES = str.maketrans(
+    {"\\": "\\\\", ";": "\\;", ",": "\\,", "\n": "\\n", "\r": ""}
+)
+
 
 @bp.route("/calendar/subscribe")
 @login_required
@@ -31,61 +59,151 @@ def subscribe():
     return redirect(url_for("regattas.index"))
 
 
-@bp.route("/calendar/<token>.ics")
-def ical_feed(token: str):
-    """Public iCal feed authenticated by secret token."""
-    user = User.query.filter_by(calendar_token=token).first_or_404()
-
-    cal = Calendar()
-    cal.add("prodid", "-//Race Crew Network//EN")
-    cal.add("version", "2.0")
-    cal.add("calscale", "GREGORIAN")
-    cal.add("x-wr-calname", "Race Crew Network")
-    cal.add("method", "PUBLISH")
+def _ical_text(value: str) -> str:
+    """Escape a value for an iCalendar TEXT property (RFC 5545 3.3.11)."""
+    return value.translate(_ICAL_TEXT_ESCAPES)
+
+
+def _fold(line: str) -> bytes:
+    """Encode a content line, folding it at 75 octets (RFC 5545 3.1)."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return data
+    parts = []
+    limit = 75
+    while len(data) > limit:
+        cut = limit
+        # Never split a multi-byte UTF-8 sequence across lines
+        while data[cut] & 0xC0 == 0x80:
+            cut -= 1
+        parts.append(data[:cut])
+        data = data[cut:]
+        limit = 74  # continuation lines start with a space
+    parts.append(data)
+    return b"\r\n ".join(parts)
+
+
+def _build_feed(user: User, crew_rows) -> bytes:
+    """Render the iCal feed for a subscriber from the (pre-fetched) crew rows.
+
+    The handful of properties a feed uses are formatted directly rather than
+    through icalendar's Event.add(), whose per-property type dispatch
+    dominated the render time for a full schedule.
+    """
+    # Crew comes from crew_rows; fail loudly if a relationship sneaks back in.
+    # Rows are fetched in batches rather than all materialized up front.
+    regattas = db.session.scalars(
+        select(Regatta)
+        .options(undefer(Regatta.notes), raiseload("*"))
+        .order_by(Regatta.start_date)
+        .execution_options(yield_per=FEED_REGATTA_BATCH)
+    )
 
-    regattas = Regatta.query.order_by(Regatta.start_date).all()
+    # The subscriber's own RSVPs come from the same crew rows
+    crew_by_regatta = defaultdict(list)
+    my_status = {}
+    for regatta_id, user_id, status, initials in crew_rows:
+        crew_by_regatta[regatta_id].append((initials, status))
+        if user_id == user.id:
+            my_status[regatta_id] = status
 
+    lines = list(_CALENDAR_HEADER)
     for regatta in regattas:
-        event = Event()
-        event.add("uid", f"regatta-{regatta.id}@racecrew.net")
         if regatta.boat_class and regatta.boat_class != "TBD":
-            event.add("summary", f"{regatta.boat_class} — {regatta.name}")
+            summary = f"{regatta.boat_class} — {regatta.name}"
         else:
-            event.add("summary", regatta.name)
-        event.add("dtstart", regatta.start_date)
+            summary = regatta.name
         # End date is exclusive in iCal, so add 1 day
         end = (regatta.end_date or regatta.start_date) + timedelta(days=1)
-        event.add("dtend", end)
-        event.add("location", regatta.location)
+        lines += (
+            "BEGIN:VEVENT",
+            f"UID:regatta-{regatta.id}@racecrew.net",
+            f"SUMMARY:{_ical_text(summary)}",
+            f"DTSTART;VALUE=DATE:{regatta.start_date:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{end:%Y%m%d}",
+            f"LOCATION:{_ical_text(regatta.location)}",
+        )
 
-        if regatta.location_url:
-            event.add("url", regatta.location_url)
+        lines.append(f"URL:{regatta.effective_location_url}")
 
         # Build description with crew RSVP status
-        lines = []
+        description = []
         if regatta.notes:
-            lines.append(regatta.notes)
+            description.append(regatta.notes)
 
-        rsvps = regatta.rsvps.all()
-        if rsvps:
-            status_map = {"yes": "Yes", "no": "No", "maybe": "Maybe"}
-            crew_lines = [
-                f"  {r.user.initials}: {status_map.get(r.status, r.status)}"
-                for r in rsvps
-            ]
-            lines.append("Crew:\n" + "\n".join(crew_lines))
+        crew = crew_by_regatta.get(regatta.id)
+        if crew:
+            crew_lines = "\n".join(
+                f"  {initials}: {STATUS_LABELS.get(status, status)}"
+                for initials, status in crew
+            )
+            description.append(f"Crew:\n{crew_lines}")
 
         # Show user's own RSVP status
-        my_rsvp = RSVP.query.filter_by(regatta_id=regatta.id, user_id=user.id).first()
-        if my_rsvp:
-            lines.append(f"Your RSVP: {my_rsvp.status.capitalize()}")
+        status = my_status.get(regatta.id)
+        if status:
+            description.append(f"Your RSVP: {status.capitalize()}")
+
+        if description:
+            lines.append("DESCRIPTION:" + _ical_text("\n\n".join(description)))
+
+        lines.append("END:VEVENT")
+    lines.append("END:VCALENDAR")
+
+    return b"\r\n".join(map(_fold, lines)) + b"\r\n"
 
-        if lines:
-            event.add("description", "\n\n".join(lines))
 
-        cal.add_component(event)
+@bp.route("/calendar/<token>.ics")
+def ical_feed(token: str):
+    """Public iCal feed authenticated by secret token."""
+    user = User.query.filter_by(calendar_token=token).first_or_404()
 
-    response = Response(cal.to_ical(), mimetype="text/calendar")
+    # Calendar apps poll the feed constantly and it rarely changes. Adding,
+    # editing or deleting a regatta or RSVP moves one of these counts or
+    # latest update times, so together they fingerprint the feed without
+    # reading every RSVP. Users have no update time, so crew initials (one
+    # short row per user) are read as well.
+    stats = db.session.execute(
+        select(
+            select(func.count(Regatta.id)).scalar_subquery(),
+            select(func.max(Regatta.updated_at)).scalar_subquery(),
+            select(func.count(RSVP.id)).scalar_subquery(),
+            select(func.max(RSVP.updated_at)).scalar_subquery(),
+        )
+    ).one()
+    initials = db.session.execute(
+        select(User.id, User.initials).order_by(User.id)
+    ).all()
+    fingerprint = repr((user.id, tuple(stats), [tuple(row) for row in initials]))
+    etag = hashlib.blake2b(fingerprint.encode("utf-8"), digest_size=16).hexdigest()
+
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    cached = _feed_cache.get(user.id)
+    if cached and cached[0] == etag:
+        body = cached[1]
+    else:
+        # Every regatta's crew in one query instead of one per regatta plus
+        # one per RSVP for the user's initials.
+        crew_rows = db.session.execute(
+            select(RSVP.regatta_id, RSVP.user_id, RSVP.status, User.initials)
+            .join(RSVP.user)
+            .order_by(RSVP.id)
+        ).all()
+        body = _build_feed(user, crew_rows)
+        if len(_feed_cache) >= FEED_CACHE_MAX_USERS:
+            _feed_cache.clear()
+        _feed_cache[user.id] = (etag, body)
+
+    response = Response(body, mimetype="text/calendar")
+    # No Last-Modified: deletes and initials edits change the feed without
+    # moving any update time, so only the ETag can tell clients it changed.
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.max_age = FEED_MAX_AGE
     response.headers["Content-Disposition"] = (
         "attachment; filename=race-crew-network.ics"
     )
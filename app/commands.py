@@ -1,10 +1,30 @@
+import csv
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 import click
-from flask import Flask
+from flask import Flask, current_app
+from sqlalchemy import select
 
 from app import db
-from app.models import User
+from app.models import User, hash_password
+
+# Columns an import-users CSV must have (is_admin is optional)
+IMPORT_USER_COLUMNS = ("email", "password", "display_name", "initials")
+
+
+def _import_user_error(user: dict[str, str]) -> str | None:
+    """Why an import-users row can't be used, by the registration form's rules."""
+    if not user["email"]:
+        return "Email is required."
+    if not user["display_name"] or not user["initials"]:
+        return "Name and initials are required."
+    if len(user["initials"]) < 2 or len(user["initials"]) > 3:
+        return "Initials must be 2-3 characters."
+    if len(user["password"]) < 6:
+        return "Password must be at least 6 characters."
+    return None
 
 
 def register_commands(app: Flask) -> None:
@@ -56,3 +76,63 @@ def register_commands(app: Flask) -> None:
         db.session.add(user)
         db.session.commit()
         click.echo(f"Admin user '{name}' ({initials.upper()}) created successfully.")
+
+    @app.cli.command("import-users")
+    @click.argument("csv_file", type=click.File("r", encoding="utf-8"))
+    def import_users(csv_file) -> None:
+        """Create users from a CSV file in one transaction.
+
+        Columns: email, password, display_name, initials and optionally
+        is_admin (yes/true/1). Emails that already exist are skipped, as are
+        rows that break the registration form's rules.
+        """
+        reader = csv.DictReader(csv_file)
+        missing = set(IMPORT_USER_COLUMNS) - set(reader.fieldnames or ())
+        if missing:
+            click.echo(f"Error: CSV is missing columns: {', '.join(sorted(missing))}")
+            raise SystemExit(1)
+
+        rows = {}
+        for row in reader:
+            # Short rows leave the missing cells as None
+            user = {
+                "email": (row["email"] or "").strip().lower(),
+                "password": row["password"] or "",
+                "display_name": (row["display_name"] or "").strip(),
+                "initials": (row["initials"] or "").strip().upper(),
+                "is_admin": (row.get("is_admin") or "").strip().lower()
+                in ("1", "true", "yes"),
+            }
+            error = _import_user_error(user)
+            if error:
+                click.echo(f"Skipping line {reader.line_num}: {error}")
+            elif user["email"] in rows:
+                click.echo(
+                    f"Skipping line {reader.line_num}: "
+                    f"duplicate email {user['email']}"
+                )
+            else:
+                rows[user["email"]] = user
+        existing = set(
+            db.session.scalars(select(User.email).where(User.email.in_(rows)))
+        )
+        for email in existing:
+            click.echo(f"Skipping {email}: user already exists.")
+            del rows[email]
+        if not rows:
+            click.echo("No users to create.")
+            return
+
+        # bcrypt releases the GIL, so the hashes are computed in parallel
+        rounds = current_app.config.get("BCRYPT_ROUNDS", 12)
+        with ThreadPoolExecutor() as pool:
+            hashes = pool.map(
+                partial(hash_password, rounds=rounds),
+                [user.pop("password") for user in rows.values()],
+            )
+            db.session.add_all(
+                User(password_hash=password_hash, **user)
+                for user, password_hash in zip(rows.values(), hashes)
+            )
+        db.session.commit()
+        click.echo(f"Created {len(rows)} user(s).")
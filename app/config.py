@@ -13,3 +13,7 @@ class Config:
     BUCKET_NAME = os.environ.get("BUCKET_NAME", "")
     AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
     ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY", "")
+    # bcrypt work factor for new password hashes (each +1 doubles the cost)
+    BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+    # Seconds to remember a successful bcrypt check (0 = always run bcrypt)
+    VERIFY_PASSWORD_CACHE_TTL = int(os.environ.get("VERIFY_PASSWORD_CACHE_TTL", "0"))
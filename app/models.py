@@ -1,10 +1,40 @@
+import hashlib
+import time
 from datetime import datetime, timezone
+from functools import lru_cache
+from urllib.parse import quote_plus
 
 import bcrypt
+from flask import current_app
 from flask_login import UserMixin
+from sqlalchemy.dialects.mysql import MEDIUMTEXT
+from sqlalchemy.orm import deferred
 
 from app import db, login_manager
 
+# Successful password checks, when VERIFY_PASSWORD_CACHE_TTL is set:
+# {sha256(password, hash): expires_at}. Only ever holds verified passwords.
+VERIFY_PASSWORD_CACHE_MAX = 1024
+_verified_passwords: dict[bytes, float] = {}
+
+
+def hash_password(password: str, rounds: int) -> str:
+    """bcrypt-hash a password with the given work factor.
+
+    Needs no app context, so bulk callers can hash on worker threads.
+    """
+    salt = bcrypt.gensalt(rounds=rounds)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+@lru_cache(maxsize=256)
+def maps_search_url(location: str) -> str:
+    """Google Maps search link for a free-text location.
+
+    Cached because the same handful of venues come up over and over.
+    """
+    return f"https://www.google.com/maps/search/{quote_plus(location)}"
+
 
 class User(UserMixin, db.Model):
     __tablename__ = "users"
@@ -25,18 +55,47 @@ class User(UserMixin, db.Model):
     calendar_token = db.Column(db.String(64), unique=True, nullable=True)
     phone = db.Column(db.String(20), nullable=True)
 
-    rsvps = db.relationship("RSVP", backref="user", lazy="dynamic")
-    documents = db.relationship("Document", backref="uploaded_by_user", lazy="dynamic")
+    rsvps = db.relationship("RSVP", back_populates="user", lazy="dynamic")
+    documents = db.relationship(
+        "Document", back_populates="uploaded_by_user", lazy="dynamic"
+    )
+    created_regattas = db.relationship("Regatta", back_populates="creator")
 
     def set_password(self, password: str) -> None:
-        self.password_hash = bcrypt.hashpw(
-            password.encode("utf-8"), bcrypt.gensalt()
-        ).decode("utf-8")
+        self.password_hash = hash_password(
+            password, current_app.config.get("BCRYPT_ROUNDS", 12)
+        )
+
+    def password_needs_rehash(self) -> bool:
+        """Whether the stored hash was made with a different BCRYPT_ROUNDS."""
+        # bcrypt hashes look like $2b$12$<salt+digest>; the cost is field 2
+        rounds = int(self.password_hash.split("$")[2])
+        return rounds != current_app.config.get("BCRYPT_ROUNDS", 12)
 
     def check_password(self, password: str) -> bool:
-        return bcrypt.checkpw(
+        ttl = current_app.config.get("VERIFY_PASSWORD_CACHE_TTL", 0)
+        if not ttl:
+            return bcrypt.checkpw(
+                password.encode("utf-8"), self.password_hash.encode("utf-8")
+            )
+
+        # Keyed on the stored hash too, so a password change invalidates it
+        key = hashlib.sha256(
+            password.encode("utf-8") + b"\0" + self.password_hash.encode("utf-8")
+        ).digest()
+        now = time.monotonic()
+        expires_at = _verified_passwords.get(key)
+        if expires_at is not None and expires_at > now:
+            return True
+
+        ok = bcrypt.checkpw(
             password.encode("utf-8"), self.password_hash.encode("utf-8")
         )
+        if ok:
+            if len(_verified_passwords) >= VERIFY_PASSWORD_CACHE_MAX:
+                _verified_passwords.clear()
+            _verified_passwords[key] = now + ttl
+        return ok
 
 
 @login_manager.user_loader
@@ -52,9 +111,10 @@ class Regatta(db.Model):
     boat_class = db.Column(db.String(100), nullable=False, default="TBD")
     location = db.Column(db.String(200), nullable=False)
     location_url = db.Column(db.String(500), nullable=True)
-    start_date = db.Column(db.Date, nullable=False)
+    start_date = db.Column(db.Date, nullable=False, index=True)
     end_date = db.Column(db.Date, nullable=True)
-    notes = db.Column(db.Text, nullable=True)
+    # Only loaded on access; queries that render notes should undefer() it
+    notes = deferred(db.Column(db.Text, nullable=True))
     created_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     created_at = db.Column(
         db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
@@ -66,14 +126,35 @@ class Regatta(db.Model):
         nullable=False,
     )
 
+    # Small per-regatta collections, loaded for a whole page of regattas in
+    # one IN query each. Deleting a regatta leaves them to the database's
+    # ON DELETE CASCADE rather than loading and deleting them row by row.
     documents = db.relationship(
-        "Document", backref="regatta", lazy="dynamic", cascade="all, delete-orphan"
+        "Document",
+        back_populates="regatta",
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     rsvps = db.relationship(
-        "RSVP", backref="regatta", lazy="dynamic", cascade="all, delete-orphan"
+        "RSVP",
+        back_populates="regatta",
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     creator = db.relationship(
-        "User", backref="created_regattas", foreign_keys=[created_by]
+        "User", back_populates="created_regattas", foreign_keys=[created_by]
+    )
+
+    @property
+    def effective_location_url(self) -> str:
+        """The link entered for the venue, else a Maps search for it."""
+        return self.location_url or maps_search_url(self.location)
+
+    __table_args__ = (
+        # Duplicate detection matches case-insensitive name + start date
+        db.Index("ix_regattas_lower_name_start_date", db.func.lower(name), start_date),
     )
 
 
@@ -81,7 +162,9 @@ class Document(db.Model):
     __tablename__ = "documents"
 
     id = db.Column(db.Integer, primary_key=True)
-    regatta_id = db.Column(db.Integer, db.ForeignKey("regattas.id"), nullable=False)
+    regatta_id = db.Column(
+        db.Integer, db.ForeignKey("regattas.id", ondelete="CASCADE"), nullable=False
+    )
     doc_type = db.Column(db.String(20), nullable=False)  # NOR, SI, WWW
     original_filename = db.Column(db.String(255), nullable=True)
     stored_filename = db.Column(db.String(255), nullable=True)
@@ -91,12 +174,17 @@ class Document(db.Model):
     )
     uploaded_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
 
+    regatta = db.relationship("Regatta", back_populates="documents")
+    uploaded_by_user = db.relationship("User", back_populates="documents")
+
 
 class RSVP(db.Model):
     __tablename__ = "rsvps"
 
     id = db.Column(db.Integer, primary_key=True)
-    regatta_id = db.Column(db.Integer, db.ForeignKey("regattas.id"), nullable=False)
+    regatta_id = db.Column(
+        db.Integer, db.ForeignKey("regattas.id", ondelete="CASCADE"), nullable=False
+    )
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     status = db.Column(db.String(10), nullable=False)  # yes, no, maybe
     updated_at = db.Column(
@@ -106,6 +194,31 @@ class RSVP(db.Model):
         nullable=False,
     )
 
+    regatta = db.relationship("Regatta", back_populates="rsvps")
+    # Every RSVP is shown with its crew member's initials or name
+    user = db.relationship("User", back_populates="rsvps", lazy="joined")
+
     __table_args__ = (
         db.UniqueConstraint("regatta_id", "user_id", name="uq_rsvp_regatta_user"),
     )
+
+
+class ImportResult(db.Model):
+    """Extraction/discovery results waiting to be picked up by a preview page.
+
+    Stored in the database (not process memory) so the preview request can be
+    served by a different worker than the one that produced the results.
+    """
+
+    __tablename__ = "import_results"
+
+    id = db.Column(db.String(36), primary_key=True)  # UUID task ID
+    kind = db.Column(db.String(20), nullable=False)  # schedule, single, discovery
+    # JSON; MEDIUMTEXT on MySQL since large batches outgrow TEXT's 64 KB
+    payload = db.Column(db.Text().with_variant(MEDIUMTEXT(), "mysql"), nullable=False)
+    created_at = db.Column(
+        db.DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        index=True,
+    )
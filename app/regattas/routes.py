@@ -1,63 +1,104 @@
+import hashlib
 import os
-import uuid
-from datetime import date
-from urllib.parse import quote_plus
+import secrets
+import threading
+from bisect import bisect_left
+from datetime import date, datetime, timezone
+from operator import attrgetter
 
 from flask import (flash, make_response, redirect, render_template, request,
                    url_for)
 from flask_login import current_user, login_required
+from sqlalchemy import delete as sql_delete
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import raiseload, selectinload, undefer
 from weasyprint import HTML
+from weasyprint.text.fonts import FontConfiguration
 
 from app import db, storage
-from app.models import RSVP, Document, Regatta, User
+from app.models import RSVP, Document, Regatta
 from app.regattas import bp
 
+# Rendered schedule PDFs keyed by a hash of their source HTML
+PDF_CACHE_MAX_ENTRIES = 8
+_pdf_cache: dict[str, bytes] = {}
+
+# One Fontconfig/Pango setup shared by every render (see _render_pdf)
+_pdf_font_config: FontConfiguration | None = None
+_pdf_render_lock = threading.Lock()
+
+
+def _render_pdf(html_str: str) -> bytes:
+    """Render HTML to PDF with a shared font configuration.
+
+    WeasyPrint otherwise builds a FontConfiguration per call, rescanning the
+    system fonts and starting with an empty Pango font cache every time.
+    Pango font maps aren't thread-safe, so renders take turns.
+    """
+    global _pdf_font_config
+    with _pdf_render_lock:
+        if _pdf_font_config is None:
+            _pdf_font_config = FontConfiguration()
+        return HTML(string=html_str).write_pdf(font_config=_pdf_font_config)
+
+
+def _load_schedule(today: date) -> tuple[list[Regatta], list[Regatta]]:
+    """Upcoming (soonest first) and past (latest first) regattas.
+
+    Everything the schedule pages render is loaded up front in one pass;
+    any other relationship access raises instead of lazy loading per row.
+    """
+    regattas = (
+        Regatta.query.options(
+            undefer(Regatta.notes),
+            selectinload(Regatta.rsvps).joinedload(RSVP.user),
+            selectinload(Regatta.documents),
+            raiseload("*"),
+        )
+        .order_by(Regatta.start_date, Regatta.id)
+        .all()
+    )
+    split = bisect_left(regattas, today, key=attrgetter("start_date"))
+    return regattas[split:], regattas[:split][::-1]
+
 
 @bp.route("/")
 @login_required
 def index():
     today = date.today()
-    upcoming = (
-        Regatta.query.filter(Regatta.start_date >= today)
-        .order_by(Regatta.start_date)
-        .all()
-    )
-    past = (
-        Regatta.query.filter(Regatta.start_date < today)
-        .order_by(Regatta.start_date.desc())
-        .all()
-    )
-    users = (
-        User.query.filter(User.invite_token.is_(None)).order_by(User.display_name).all()
-    )
-    return render_template("index.html", upcoming=upcoming, past=past, users=users)
+    upcoming, past = _load_schedule(today)
+    return render_template("index.html", upcoming=upcoming, past=past)
 
 
 @bp.route("/schedule.pdf")
 @login_required
 def pdf():
     today = date.today()
-    upcoming = (
-        Regatta.query.filter(Regatta.start_date >= today)
-        .order_by(Regatta.start_date)
-        .all()
-    )
-    past = (
-        Regatta.query.filter(Regatta.start_date < today)
-        .order_by(Regatta.start_date.desc())
-        .all()
-    )
+    upcoming, past = _load_schedule(today)
     html_str = render_template(
         "pdf_schedule.html",
         upcoming=upcoming,
         past=past,
         generated_date=today.strftime("%B %d, %Y"),
     )
-    pdf_bytes = HTML(string=html_str).write_pdf()
+    # The queries and template are cheap next to WeasyPrint's layout, and the
+    # HTML captures everything the PDF shows, so identical HTML reuses the PDF.
+    key = hashlib.blake2b(html_str.encode("utf-8"), digest_size=16).hexdigest()
+    pdf_bytes = _pdf_cache.get(key)
+    if pdf_bytes is None:
+        pdf_bytes = _render_pdf(html_str)
+        if len(_pdf_cache) >= PDF_CACHE_MAX_ENTRIES:
+            _pdf_cache.clear()
+        _pdf_cache[key] = pdf_bytes
+
     response = make_response(pdf_bytes)
     response.headers["Content-Type"] = "application/pdf"
     response.headers["Content-Disposition"] = "inline; filename=race-crew-schedule.pdf"
-    return response
+    response.set_etag(key)
+    return response.make_conditional(request)
 
 
 @bp.route("/regattas/new", methods=["GET", "POST"])
@@ -80,7 +121,12 @@ def edit(regatta_id: int):
         flash("Access denied.", "error")
         return redirect(url_for("regattas.index"))
 
-    regatta = db.session.get(Regatta, regatta_id)
+    # The form shows notes and documents but never the crew
+    regatta = db.session.get(
+        Regatta,
+        regatta_id,
+        options=[undefer(Regatta.notes), raiseload(Regatta.rsvps)],
+    )
     if not regatta:
         flash("Regatta not found.", "error")
         return redirect(url_for("regattas.index"))
@@ -98,11 +144,12 @@ def delete(regatta_id: int):
         flash("Access denied.", "error")
         return redirect(url_for("regattas.index"))
 
-    regatta = db.session.get(Regatta, regatta_id)
-    if regatta:
-        db.session.delete(regatta)
+    # One DELETE; the database cascades it to the regatta's documents and RSVPs
+    name = db.session.scalar(select(Regatta.name).where(Regatta.id == regatta_id))
+    if name is not None:
+        db.session.execute(sql_delete(Regatta).where(Regatta.id == regatta_id))
         db.session.commit()
-        flash(f"Regatta '{regatta.name}' deleted.", "success")
+        flash(f"Regatta '{name}' deleted.", "success")
     return redirect(url_for("regattas.index"))
 
 
@@ -118,22 +165,63 @@ def bulk_delete():
         flash("No regattas selected.", "warning")
         return redirect(url_for("regattas.index"))
 
-    count = 0
+    ids = set()
     for regatta_id in selected:
         try:
-            rid = int(regatta_id)
+            ids.add(int(regatta_id))
         except (ValueError, TypeError):
             continue
-        regatta = db.session.get(Regatta, rid)
-        if regatta:
-            db.session.delete(regatta)
-            count += 1
 
+    count = 0
+    if ids:
+        # One DELETE; the database cascades it to documents and RSVPs
+        result = db.session.execute(sql_delete(Regatta).where(Regatta.id.in_(ids)))
+        count = result.rowcount
     db.session.commit()
     flash(f"Deleted {count} regatta(s).", "success")
     return redirect(url_for("regattas.index"))
 
 
+def _upsert_rsvp(regatta_id: int, user_id: int, status: str) -> None:
+    """Insert the user's RSVP, or update it if one exists, in one statement.
+
+    Relies on the uq_rsvp_regatta_user constraint instead of a SELECT first.
+    Databases without a known upsert fall back to reading the RSVP first.
+    """
+    values = {
+        "regatta_id": regatta_id,
+        "user_id": user_id,
+        "status": status,
+        "updated_at": datetime.now(timezone.utc),
+    }
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(RSVP).values(values)
+        stmt = stmt.on_duplicate_key_update(
+            status=stmt.inserted.status, updated_at=stmt.inserted.updated_at
+        )
+    elif dialect in ("sqlite", "postgresql"):
+        insert = sqlite_insert if dialect == "sqlite" else postgresql_insert
+        stmt = insert(RSVP).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["regatta_id", "user_id"],
+            set_={
+                "status": stmt.excluded.status,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    else:
+        existing = db.session.scalar(
+            select(RSVP).filter_by(regatta_id=regatta_id, user_id=user_id)
+        )
+        if existing:
+            existing.status = status
+        else:
+            db.session.add(RSVP(regatta_id=regatta_id, user_id=user_id, status=status))
+        return
+    db.session.execute(stmt)
+
+
 @bp.route("/regattas/<int:regatta_id>/rsvp", methods=["POST"])
 @login_required
 def rsvp(regatta_id: int):
@@ -142,17 +230,7 @@ def rsvp(regatta_id: int):
         flash("Invalid RSVP status.", "error")
         return redirect(url_for("regattas.index"))
 
-    existing = RSVP.query.filter_by(
-        regatta_id=regatta_id, user_id=current_user.id
-    ).first()
-
-    if existing:
-        existing.status = status
-    else:
-        db.session.add(
-            RSVP(regatta_id=regatta_id, user_id=current_user.id, status=status)
-        )
-
+    _upsert_rsvp(regatta_id, current_user.id, status)
     db.session.commit()
     return redirect(url_for("regattas.index"))
 
@@ -178,7 +256,8 @@ def upload_doc(regatta_id: int):
         flash("Access denied.", "error")
         return redirect(url_for("regattas.index"))
 
-    regatta = db.session.get(Regatta, regatta_id)
+    # Only checks the regatta exists; skip loading its collections
+    regatta = db.session.get(Regatta, regatta_id, options=[raiseload("*")])
     if not regatta:
         flash("Regatta not found.", "error")
         return redirect(url_for("regattas.index"))
@@ -201,7 +280,7 @@ def upload_doc(regatta_id: int):
     elif file and file.filename:
         # File-based document
         ext = os.path.splitext(file.filename)[1].lower()
-        stored_filename = f"{uuid.uuid4().hex}{ext}"
+        stored_filename = f"{secrets.token_urlsafe(16)}{ext}"
 
         storage.upload_file(file, stored_filename)
 
@@ -272,13 +351,8 @@ def _save_regatta(regatta: Regatta | None):
     regatta.name = name
     regatta.boat_class = boat_class
     regatta.location = location
-    if location_url:
-        regatta.location_url = location_url
-    else:
-        # Auto-generate Google Maps search link from location text
-        regatta.location_url = (
-            f"https://www.google.com/maps/search/{quote_plus(location)}"
-        )
+    # Left empty, effective_location_url falls back to a Maps search
+    regatta.location_url = location_url or None
     regatta.start_date = start_date
     regatta.end_date = end_date
     regatta.notes = notes or None
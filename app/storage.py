@@ -1,16 +1,36 @@
+import time
+
 import boto3
 from botocore.exceptions import ClientError
 from flask import current_app
 
+# Presigned download URLs are valid for an hour. Handing out the same URL
+# for most of that time lets browsers revalidate their cached copy with S3
+# (ETag/304) instead of downloading a fresh URL's file again on every click.
+PRESIGNED_URL_EXPIRES = 3600
+PRESIGNED_URL_REUSE = 3000  # stop reusing a URL 10 minutes before it expires
+PRESIGNED_URL_CACHE_MAX = 1024
+_presigned_urls: dict[tuple[str, str], tuple[float, str]] = {}
+
 
 def _get_client():
-    """Return a boto3 S3 client configured for Lightsail Object Storage."""
+    """Return the app's S3 client for Lightsail Object Storage.
+
+    Building a boto3 client loads and parses botocore's service model, which
+    costs far more than a small upload, so one client (thread-safe) is made
+    on first use and cached on the app.
+    """
     region = current_app.config["AWS_REGION"]
-    return boto3.client(
-        "s3",
-        region_name=region,
-        endpoint_url=f"https://s3.{region}.amazonaws.com",
-    )
+    cached = current_app.extensions.get("s3_client")
+    if cached is None or cached[0] != region:
+        client = boto3.client(
+            "s3",
+            region_name=region,
+            endpoint_url=f"https://s3.{region}.amazonaws.com",
+        )
+        cached = (region, client)
+        current_app.extensions["s3_client"] = cached
+    return cached[1]
 
 
 def upload_file(file, stored_filename: str) -> None:
@@ -21,19 +41,30 @@ def upload_file(file, stored_filename: str) -> None:
 
 
 def get_file_url(stored_filename: str) -> str:
-    """Return a presigned URL (valid 1 hour) for downloading a file."""
+    """Return a presigned URL (valid up to 1 hour) for downloading a file."""
     bucket = current_app.config["BUCKET_NAME"]
+    key = (bucket, stored_filename)
+    now = time.monotonic()
+    cached = _presigned_urls.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+
     client = _get_client()
-    return client.generate_presigned_url(
+    url = client.generate_presigned_url(
         "get_object",
         Params={"Bucket": bucket, "Key": stored_filename},
-        ExpiresIn=3600,
+        ExpiresIn=PRESIGNED_URL_EXPIRES,
     )
+    if len(_presigned_urls) >= PRESIGNED_URL_CACHE_MAX:
+        _presigned_urls.clear()
+    _presigned_urls[key] = (now + PRESIGNED_URL_REUSE, url)
+    return url
 
 
 def delete_file(stored_filename: str) -> None:
     """Delete a file from the S3 bucket. Silently ignores missing files."""
     bucket = current_app.config["BUCKET_NAME"]
+    _presigned_urls.pop((bucket, stored_filename), None)
     client = _get_client()
     try:
         client.delete_object(Bucket=bucket, Key=stored_filename)
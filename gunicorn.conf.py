@@ -1,4 +1,8 @@
 bind = "0.0.0.0:8000"
 workers = 2
+# Import/discovery streams spend most of their time waiting on remote pages
+# and the Claude API; threads keep one long stream from tying up a worker.
+worker_class = "gthread"
+threads = 4
 accesslog = "-"
 errorlog = "-"
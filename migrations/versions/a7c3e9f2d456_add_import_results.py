@@ -0,0 +1,36 @@
+"""Add import_results table
+
+Revision ID: a7c3e9f2d456
+Revises: f5a3d8e1b234
+Create Date: 2026-10-15
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+revision = "a7c3e9f2d456"
+down_revision = "f5a3d8e1b234"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "import_results",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column(
+            "payload",
+            sa.Text().with_variant(mysql.MEDIUMTEXT(), "mysql"),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_import_results_created_at", "import_results", ["created_at"])
+
+
+def downgrade():
+    op.drop_index("ix_import_results_created_at", table_name="import_results")
+    op.drop_table("import_results")
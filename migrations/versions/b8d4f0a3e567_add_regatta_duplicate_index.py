@@ -0,0 +1,26 @@
+"""Add index on lower(name), start_date to regattas
+
+Revision ID: b8d4f0a3e567
+Revises: a7c3e9f2d456
+Create Date: 2026-10-15
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "b8d4f0a3e567"
+down_revision = "a7c3e9f2d456"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_regattas_lower_name_start_date",
+        "regattas",
+        [sa.func.lower(sa.column("name")), "start_date"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_regattas_lower_name_start_date", table_name="regattas")
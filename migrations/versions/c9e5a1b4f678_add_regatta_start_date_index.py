@@ -0,0 +1,21 @@
+"""Add index on regattas.start_date
+
+Revision ID: c9e5a1b4f678
+Revises: b8d4f0a3e567
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+
+revision = "c9e5a1b4f678"
+down_revision = "b8d4f0a3e567"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_regattas_start_date", "regattas", ["start_date"])
+
+
+def downgrade():
+    op.drop_index("ix_regattas_start_date", table_name="regattas")
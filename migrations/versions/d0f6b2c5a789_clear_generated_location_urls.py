@@ -0,0 +1,63 @@
+"""Clear auto-generated Google Maps links from regattas.location_url
+
+The Maps search link is now derived from the location when needed, so
+only links entered by hand are stored.
+
+Revision ID: d0f6b2c5a789
+Revises: c9e5a1b4f678
+Create Date: 2026-10-15
+"""
+
+from urllib.parse import quote_plus
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "d0f6b2c5a789"
+down_revision = "c9e5a1b4f678"
+branch_labels = None
+depends_on = None
+
+MAPS_SEARCH_URL = "https://www.google.com/maps/search/"
+
+regattas = sa.table(
+    "regattas",
+    sa.column("id", sa.Integer),
+    sa.column("location", sa.String),
+    sa.column("location_url", sa.String),
+)
+
+
+def upgrade():
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(regattas.c.id, regattas.c.location, regattas.c.location_url).where(
+            regattas.c.location_url.like(MAPS_SEARCH_URL + "%")
+        )
+    ).all()
+    generated = [
+        row.id
+        for row in rows
+        if row.location_url == MAPS_SEARCH_URL + quote_plus(row.location)
+    ]
+    if generated:
+        conn.execute(
+            regattas.update()
+            .where(regattas.c.id.in_(generated))
+            .values(location_url=None)
+        )
+
+
+def downgrade():
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(regattas.c.id, regattas.c.location).where(
+            regattas.c.location_url.is_(None)
+        )
+    ).all()
+    for row in rows:
+        conn.execute(
+            regattas.update()
+            .where(regattas.c.id == row.id)
+            .values(location_url=MAPS_SEARCH_URL + quote_plus(row.location))
+        )
@@ -0,0 +1,41 @@
+"""Cascade regatta deletes to documents and RSVPs in the database
+
+Revision ID: e1a7c3d6b890
+Revises: d0f6b2c5a789
+Create Date: 2026-10-15
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "e1a7c3d6b890"
+down_revision = "d0f6b2c5a789"
+branch_labels = None
+depends_on = None
+
+CHILD_TABLES = ("documents", "rsvps")
+
+
+def _replace_regatta_fk(table, ondelete):
+    # The initial schema left these constraints unnamed, so look them up
+    for fk in sa.inspect(op.get_bind()).get_foreign_keys(table):
+        if fk["referred_table"] == "regattas":
+            op.drop_constraint(fk["name"], table, type_="foreignkey")
+    op.create_foreign_key(
+        f"fk_{table}_regatta_id",
+        table,
+        "regattas",
+        ["regatta_id"],
+        ["id"],
+        ondelete=ondelete,
+    )
+
+
+def upgrade():
+    for table in CHILD_TABLES:
+        _replace_regatta_fk(table, "CASCADE")
+
+
+def downgrade():
+    for table in CHILD_TABLES:
+        _replace_regatta_fk(table, None)
@@ -1,4 +1,7 @@
 import pytest
+from flask.globals import app_ctx
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session, sessionmaker
 
 from app import create_app
 from app import db as _db
@@ -10,27 +13,65 @@ TEST_CONFIG = {
     "WTF_CSRF_ENABLED": False,
     "SERVER_NAME": "localhost",
     "ANTHROPIC_API_KEY": "test-key",
+    "BCRYPT_ROUNDS": 4,
 }
 
 
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "no_db: the test never touches the database, so skip its setup"
+    )
+
+
+def _configure_sqlite(dbapi_conn, _connection_record):
+    dbapi_conn.isolation_level = None
+    dbapi_conn.execute("PRAGMA foreign_keys=ON")
+
+
 @pytest.fixture(scope="session")
 def app():
     """Create a Flask app and tables once per test session."""
     app = create_app(test_config=TEST_CONFIG)
 
     with app.app_context():
+        # pysqlite doesn't emit BEGIN itself, which breaks SAVEPOINTs; let
+        # SQLAlchemy manage transactions so each test can be rolled back.
+        # Foreign keys are enforced, as on MySQL, so ON DELETE CASCADE works.
+        engine = _db.engine
+        event.listen(engine, "connect", _configure_sqlite)
+        event.listen(engine, "begin", lambda conn: conn.exec_driver_sql("BEGIN"))
         _db.create_all()
-        yield app
-        _db.drop_all()
+
+    return app
 
 
 @pytest.fixture(autouse=True)
-def _clean_db(app):
-    """Delete all rows after each test (no schema rebuild)."""
-    yield
-    for table in reversed(_db.metadata.sorted_tables):
-        _db.session.execute(table.delete())
-    _db.session.commit()
+def _transaction(app, request):
+    """Run each test in its own app context and roll back everything it wrote.
+
+    The session is bound to one connection inside an outer transaction, and
+    every commit() made by the app only releases a SAVEPOINT, so a single
+    ROLLBACK at the end discards the test's data. Tests marked ``no_db`` get
+    the app context only.
+    """
+    with app.app_context():
+        if request.node.get_closest_marker("no_db"):
+            yield
+            return
+        connection = _db.engine.connect()
+        transaction = connection.begin()
+        session = scoped_session(
+            sessionmaker(bind=connection, join_transaction_mode="create_savepoint"),
+            scopefunc=lambda: id(app_ctx._get_current_object()),
+        )
+        original_session, _db.session = _db.session, session
+        try:
+            yield
+        finally:
+            session.remove()
+            _db.session = original_session
+            transaction.rollback()
+            connection.close()
 
 
 @pytest.fixture()
@@ -1,18 +1,104 @@
 """Tests for helper functions in app.admin.routes."""
 
 import json
+from datetime import date
 from unittest.mock import MagicMock, patch
 
 import pytest
 from bs4 import BeautifulSoup
 
+from app.admin import routes
 from app.admin.routes import (_extract_data_attributes,
-                              _fetch_clubspot_documents, _is_private_ip,
-                              _parse_clubspot_regatta_id)
+                              _extract_jsonld_events,
+                              _fetch_clubspot_documents, _fetch_url_content,
+                              _find_duplicate, _find_duplicates, _form_row,
+                              _is_private_ip, _parse_clubspot_regatta_id,
+                              _sse, _summarize_jsonld_events)
+from app.models import Regatta
+
+# --- _sse ---
+
+
+class TestSse:
+    def test_encodes_event_as_bytes(self):
+        frame = _sse({"type": "progress", "message": "Skipping — no URL"})
+        assert frame.startswith(b"data: ")
+        assert frame.endswith(b"\n\n")
+        assert json.loads(frame[6:]) == {
+            "type": "progress",
+            "message": "Skipping — no URL",
+        }
+
+
+# --- _form_row ---
+
+
+class TestFormRow:
+    def test_reads_stripped_fields_for_index(self):
+        form = {"name_3": "  Spring Regatta ", "start_date_3": "2026-05-01"}
+        row = _form_row(form, "3", ("name", "start_date", "notes"))
+        assert row == {
+            "name": "Spring Regatta",
+            "start_date": "2026-05-01",
+            "notes": "",
+        }
+
+
+# --- _find_duplicates ---
+
+
+class TestFindDuplicate:
+    def test_matches_case_insensitive(self, db, admin_user):
+        existing = Regatta(
+            name="Spring Regatta",
+            location="Test YC",
+            start_date=date(2026, 5, 1),
+            created_by=admin_user.id,
+        )
+        db.session.add(existing)
+        db.session.commit()
+
+        assert _find_duplicate("spring REGATTA", date(2026, 5, 1)) is existing
+        # Same cached statement, different bound values
+        assert _find_duplicate("Spring Regatta", date(2026, 5, 2)) is None
+        assert _find_duplicate("Fall Regatta", date(2026, 5, 1)) is None
+
+
+class TestFindDuplicates:
+    def test_empty_candidates(self, app):
+        assert _find_duplicates([]) == {}
+
+    def test_matches_case_insensitive_name_and_date(self, db, admin_user):
+        existing = Regatta(
+            name="Spring Regatta",
+            location="Test YC",
+            start_date=date(2026, 5, 1),
+            created_by=admin_user.id,
+        )
+        db.session.add(existing)
+        db.session.commit()
+
+        result = _find_duplicates(
+            [
+                ("SPRING REGATTA", date(2026, 5, 1)),
+                ("Spring Regatta", date(2026, 5, 2)),
+                ("Fall Regatta", date(2026, 5, 1)),
+            ]
+        )
+        assert result == {("spring regatta", date(2026, 5, 1)): existing}
+
 
 # --- _is_private_ip ---
 
 
+@pytest.fixture()
+def _empty_dns_cache():
+    routes._dns_cache.clear()
+    yield
+    routes._dns_cache.clear()
+
+
+@pytest.mark.usefixtures("_empty_dns_cache")
 class TestIsPrivateIp:
     def test_public_ip(self):
         assert _is_private_ip("google.com") is False
@@ -26,6 +112,21 @@ class TestIsPrivateIp:
     def test_unresolvable_returns_true(self):
         assert _is_private_ip("does-not-exist.invalid") is True
 
+    @patch("app.admin.routes.getaddrinfo")
+    def test_resolution_is_cached(self, mock_getaddrinfo):
+        mock_getaddrinfo.return_value = [(2, 1, 6, "", ("93.184.216.34", 0))]
+        assert _is_private_ip("example.com") is False
+        assert _is_private_ip("example.com") is False
+        mock_getaddrinfo.assert_called_once()
+
+    @patch("app.admin.routes.getaddrinfo")
+    def test_cache_expires(self, mock_getaddrinfo, monkeypatch):
+        mock_getaddrinfo.return_value = [(2, 1, 6, "", ("93.184.216.34", 0))]
+        monkeypatch.setattr(routes, "DNS_CACHE_TTL", -1)
+        _is_private_ip("example.com")
+        _is_private_ip("example.com")
+        assert mock_getaddrinfo.call_count == 2
+
 
 # --- _parse_clubspot_regatta_id ---
 
@@ -100,11 +201,85 @@ class TestExtractDataAttributes:
         assert result == ""
 
 
+# --- _extract_jsonld_events ---
+
+
+def _jsonld_text(html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    return _summarize_jsonld_events(_extract_jsonld_events(soup))
+
+
+class TestExtractJsonldEvents:
+    def test_no_jsonld_returns_empty(self):
+        assert _jsonld_text("<html><body>Hi</body></html>") == ""
+
+    def test_extracts_event(self):
+        html = (
+            '<script type="application/ld+json">'
+            '{"@type": "Event", "name": "Midwinters", "startDate": "2026-03-01",'
+            ' "endDate": "2026-03-02", "location": {"name": "Test YC"}}'
+            "</script>"
+        )
+        result = _jsonld_text(html)
+        assert "Midwinters | 2026-03-01 - 2026-03-02 | Test YC" in result
+
+    def test_extracts_graph_events(self):
+        html = (
+            '<script type="application/ld+json">'
+            '{"@graph": [{"@type": "WebPage"}, {"@type": "Event", "name": "Graph"}]}'
+            "</script>"
+        )
+        assert "- Graph" in _jsonld_text(html)
+
+    def test_list_and_nested_graph(self):
+        html = (
+            '<script type="application/ld+json">'
+            '[{"@type": "Event", "name": "First"}, "stray",'
+            ' {"@graph": [{"@graph": [{"@type": "Event", "name": "Nested"}]}]},'
+            ' {"@type": "Event", "name": "Last"}]'
+            "</script>"
+        )
+        lines = _jsonld_text(html).splitlines()[1:]
+        assert [line.split(" | ")[0] for line in lines] == [
+            "- First",
+            "- Nested",
+            "- Last",
+        ]
+
+    def test_matches_single_quoted_type(self):
+        html = (
+            "<script type='application/ld+json'>"
+            '{"@type": "Event", "name": "Quoted"}'
+            "</script>"
+        )
+        assert "- Quoted" in _jsonld_text(html)
+
+    def test_includes_event_url(self):
+        html = (
+            '<script type="application/ld+json">'
+            '{"@type": "Event", "name": "Linked", "url": "https://example.com/e"}'
+            "</script>"
+        )
+        assert "- Linked" in _jsonld_text(html)
+        assert "| https://example.com/e" in _jsonld_text(html)
+
+    def test_skips_malformed_block(self):
+        html = '<script type="application/ld+json">{not json</script>'
+        assert _jsonld_text(html) == ""
+
+
 # --- _fetch_clubspot_documents ---
 
 
+@pytest.fixture(autouse=True)
+def _empty_clubspot_cache():
+    routes._clubspot_cache.clear()
+    yield
+    routes._clubspot_cache.clear()
+
+
 class TestFetchClubspotDocuments:
-    @patch("app.admin.routes.requests.get")
+    @patch("app.admin.routes.SESSION.get")
     def test_returns_nor_document(self, mock_get):
         mock_resp = MagicMock()
         mock_resp.json.return_value = {
@@ -126,7 +301,7 @@ class TestFetchClubspotDocuments:
         assert docs[0]["url"] == "https://cdn.example.com/nor.pdf"
         assert docs[0]["label"] == "Notice of Race"
 
-    @patch("app.admin.routes.requests.get")
+    @patch("app.admin.routes.SESSION.get")
     def test_returns_si_document(self, mock_get):
         mock_resp = MagicMock()
         mock_resp.json.return_value = {
@@ -146,7 +321,7 @@ class TestFetchClubspotDocuments:
         assert len(docs) == 1
         assert docs[0]["doc_type"] == "SI"
 
-    @patch("app.admin.routes.requests.get")
+    @patch("app.admin.routes.SESSION.get")
     def test_ignores_unknown_doc_types(self, mock_get):
         mock_resp = MagicMock()
         mock_resp.json.return_value = {
@@ -163,7 +338,7 @@ class TestFetchClubspotDocuments:
         docs = _fetch_clubspot_documents("abc123")
         assert docs == []
 
-    @patch("app.admin.routes.requests.get")
+    @patch("app.admin.routes.SESSION.get")
     def test_ignores_docs_without_url(self, mock_get):
         mock_resp = MagicMock()
         mock_resp.json.return_value = {"results": [{"type": "nor", "URL": ""}]}
@@ -173,7 +348,7 @@ class TestFetchClubspotDocuments:
         docs = _fetch_clubspot_documents("abc123")
         assert docs == []
 
-    @patch("app.admin.routes.requests.get")
+    @patch("app.admin.routes.SESSION.get")
     def test_returns_empty_on_api_error(self, mock_get):
         import requests
 
@@ -181,7 +356,7 @@ class TestFetchClubspotDocuments:
         docs = _fetch_clubspot_documents("abc123")
         assert docs == []
 
-    @patch("app.admin.routes.requests.get")
+    @patch("app.admin.routes.SESSION.get")
     def test_returns_multiple_docs(self, mock_get):
         mock_resp = MagicMock()
         mock_resp.json.return_value = {
@@ -197,7 +372,7 @@ class TestFetchClubspotDocuments:
         assert len(docs) == 2
         assert {d["doc_type"] for d in docs} == {"NOR", "SI"}
 
-    @patch("app.admin.routes.requests.get")
+    @patch("app.admin.routes.SESSION.get")
     def test_sends_correct_headers(self, mock_get):
         mock_resp = MagicMock()
         mock_resp.json.return_value = {"results": []}
@@ -209,3 +384,142 @@ class TestFetchClubspotDocuments:
         call_kwargs = mock_get.call_args
         headers = call_kwargs.kwargs.get("headers") or call_kwargs[1].get("headers")
         assert headers["X-Parse-Application-Id"] == "myclubspot2017"
+
+    @patch("app.admin.routes.SESSION.get")
+    def test_caches_documents_per_regatta(self, mock_get):
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {
+            "results": [{"type": "si", "URL": "https://cdn.example.com/si.pdf"}]
+        }
+        mock_get.return_value = mock_resp
+
+        first = _fetch_clubspot_documents("abc123")
+        first.append({"doc_type": "WWW", "url": "x", "label": "y"})
+        second = _fetch_clubspot_documents("abc123")
+
+        assert mock_get.call_count == 1
+        assert [d["doc_type"] for d in second] == ["SI"]
+
+    @patch("app.admin.routes.SESSION.get")
+    def test_failed_request_is_not_cached(self, mock_get):
+        import requests
+
+        mock_get.side_effect = requests.ConnectionError("down")
+        assert _fetch_clubspot_documents("abc123") == []
+        assert _fetch_clubspot_documents("abc123") == []
+        assert mock_get.call_count == 2
+
+    def test_session_sends_user_agent(self):
+        assert routes.SESSION.headers["User-Agent"] == "RaceCrewNetwork/1.0"
+
+
+# --- _fetch_url_content ---
+
+
+def _html_response(html: str) -> MagicMock:
+    mock_resp = MagicMock()
+    mock_resp.headers = {"Content-Type": "text/html; charset=utf-8"}
+    mock_resp.encoding = "utf-8"
+    mock_resp.iter_content.return_value = [html.encode("utf-8")]
+    mock_resp.raise_for_status = MagicMock()
+    return mock_resp
+
+
+@patch("app.admin.routes._is_private_ip", return_value=False)
+class TestFetchUrlContent:
+    @patch("app.admin.routes.SESSION.get")
+    def test_strips_page_chrome(self, mock_get, _mock_private):
+        mock_get.return_value = _html_response(
+            "<html><head><style>p {}</style></head><body>"
+            "<nav>Menu</nav><p>Spring Regatta</p><script>var x;</script>"
+            "<footer>Copyright</footer></body></html>"
+        )
+        text = _fetch_url_content("https://example.com/events")
+        assert "Spring Regatta" in text
+        for chrome in ("Menu", "var x", "Copyright", "p {}"):
+            assert chrome not in text
+
+    @patch("app.admin.routes.SESSION.get")
+    def test_preserves_absolute_link_urls(self, mock_get, _mock_private):
+        mock_get.return_value = _html_response(
+            '<html><body><a href="/nor.pdf">NOR</a></body></html>'
+        )
+        text = _fetch_url_content("https://example.com/events/")
+        assert "NOR [https://example.com/nor.pdf]" in text
+
+    @patch("app.admin.routes.SESSION.get")
+    def test_drops_links_inside_page_chrome(self, mock_get, _mock_private):
+        mock_get.return_value = _html_response(
+            '<html><body><nav><a href="/home">Home</a></nav>'
+            '<p><a href="/si.pdf">SI</a></p></body></html>'
+        )
+        text = _fetch_url_content("https://example.com/")
+        assert "SI [https://example.com/si.pdf]" in text
+        assert "Home" not in text
+
+    @patch("app.admin.routes.SESSION.get")
+    def test_download_is_capped(self, mock_get, _mock_private, monkeypatch):
+        monkeypatch.setattr(routes, "MAX_TEXT_FETCH_BYTES", 10)
+        mock_resp = MagicMock()
+        mock_resp.headers = {"Content-Type": "text/plain"}
+        mock_resp.encoding = "utf-8"
+        chunks = iter([b"0123456789", b"abcdefghij", b"never read"])
+        mock_resp.iter_content.return_value = chunks
+        mock_get.return_value = mock_resp
+
+        assert _fetch_url_content("https://example.com/big.txt") == "0123456789"
+        assert next(chunks) == b"abcdefghij"
+        assert mock_get.call_args.kwargs["stream"] is True
+        mock_resp.close.assert_called_once()
+
+    @patch("app.admin.routes.SESSION.get")
+    def test_html_uses_larger_download_cap(self, mock_get, _mock_private, monkeypatch):
+        monkeypatch.setattr(routes, "MAX_TEXT_FETCH_BYTES", 10)
+        mock_get.return_value = _html_response(
+            "<html><body><p>Spring Regatta Championship</p></body></html>"
+        )
+        text = _fetch_url_content("https://example.com/events")
+        assert text == "Spring Regatta Championship"
+
+    @patch("app.admin.routes.SESSION.get")
+    def test_structured_only_skips_page_text(self, mock_get, _mock_private):
+        mock_get.return_value = _html_response(
+            '<html><body><script type="application/ld+json">'
+            '{"@type": "Event", "name": "Midwinters", "startDate": "2026-03-01"}'
+            "</script><p>Page body</p></body></html>"
+        )
+        text = _fetch_url_content("https://example.com/e", structured_only=True)
+        assert "- Midwinters | 2026-03-01" in text
+        assert "Page body" not in text
+
+    @patch("app.admin.routes.SESSION.get")
+    def test_structured_only_needs_complete_events(self, mock_get, _mock_private):
+        mock_get.return_value = _html_response(
+            '<html><body><script type="application/ld+json">'
+            '{"@type": "Event", "name": "No date"}'
+            "</script><p>Page body</p></body></html>"
+        )
+        text = _fetch_url_content("https://example.com/e", structured_only=True)
+        assert "Page body" in text
+
+    @patch("app.admin.routes.SESSION.get")
+    def test_html_like_vendor_type_is_plain_text(self, mock_get, _mock_private):
+        mock_resp = _html_response("<p>raw</p>")
+        mock_resp.headers = {"Content-Type": "application/vnd.xhtmlthing"}
+        mock_get.return_value = mock_resp
+        assert _fetch_url_content("https://example.com/x") == "<p>raw</p>"
+
+    @patch("app.admin.routes.SESSION.get")
+    def test_extracts_data_attributes(self, mock_get, _mock_private):
+        mock_get.return_value = _html_response(
+            '<html><body class="a b" data-regatta=\'{"name": "Hydrated"}\'>'
+            "<p>Body text</p></body></html>"
+        )
+        text = _fetch_url_content("https://example.com/events")
+        assert text.startswith("Structured data from page attributes:")
+        assert "Hydrated" in text
+        assert "Body text" in text
+
+    def test_rejects_non_http_scheme(self, _mock_private):
+        with pytest.raises(ValueError, match="Only HTTP"):
+            _fetch_url_content("ftp://example.com/file")
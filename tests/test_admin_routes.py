@@ -1,8 +1,11 @@
 """Tests for admin routes (access control and basic flows)."""
 
-from datetime import date
+import threading
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
 
-from app.models import Regatta, User
+from app.admin.routes import _save_import_result
+from app.models import ImportResult, Regatta, User
 
 
 class TestAdminAccessUnauthenticated:
@@ -69,6 +72,18 @@ class TestAdminAccessAuthenticated:
         assert b"Paste Schedule Text" in resp.data
 
 
+class TestImportScheduleExtract:
+    @patch("app.admin.routes.extract_regattas", return_value=[])
+    def test_invalid_year_falls_back_to_current(self, mock_extract, logged_in_client):
+        resp = logged_in_client.post(
+            "/admin/import-schedule/extract",
+            data={"schedule_text": "Spring Regatta May 1", "year": "soon"},
+        )
+        assert resp.status_code == 200
+        assert b"No regattas found" in resp.data
+        mock_extract.assert_called_once_with("Spring Regatta May 1", date.today().year)
+
+
 class TestImportSchedulePreview:
     def test_missing_task_id_redirects(self, logged_in_client):
         resp = logged_in_client.get(
@@ -98,6 +113,37 @@ class TestImportSinglePreview:
         )
         assert b"Extraction results not found" in resp.data
 
+    def test_stored_result_is_shown_once(self, logged_in_client):
+        _save_import_result(
+            "task-1", "single", {"regatta": {"name": "Stored Regatta"}, "year": 2026}
+        )
+        resp = logged_in_client.get("/admin/import-single/preview?task_id=task-1")
+        assert b"Stored Regatta" in resp.data
+
+        resp = logged_in_client.get(
+            "/admin/import-single/preview?task_id=task-1", follow_redirects=True
+        )
+        assert b"Extraction results not found" in resp.data
+
+    def test_expired_result_is_rejected(self, logged_in_client, db):
+        _save_import_result("task-2", "single", {"regatta": {}, "year": 2026})
+        result = db.session.get(ImportResult, "task-2")
+        result.created_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        db.session.commit()
+
+        resp = logged_in_client.get(
+            "/admin/import-single/preview?task_id=task-2", follow_redirects=True
+        )
+        assert b"Extraction results not found" in resp.data
+        assert db.session.get(ImportResult, "task-2") is None
+
+    def test_other_kind_of_result_is_rejected(self, logged_in_client):
+        _save_import_result("task-3", "discovery", [])
+        resp = logged_in_client.get(
+            "/admin/import-single/preview?task_id=task-3", follow_redirects=True
+        )
+        assert b"Extraction results not found" in resp.data
+
 
 class TestImportScheduleConfirm:
     def test_no_selection_redirects(self, logged_in_client):
@@ -180,6 +226,28 @@ class TestImportScheduleConfirm:
         )
         assert b"Skipped 1 regatta" in resp.data
 
+    def test_skips_duplicate_within_batch(self, app, logged_in_client, db):
+        row = {
+            "location": "Test YC",
+            "start_date": "2026-10-15",
+            "end_date": "",
+            "notes": "",
+            "location_url": "",
+            "doc_count": "0",
+        }
+        data = {"selected": ["0", "1"], "name_0": "Batch Dup", "name_1": "batch dup"}
+        for idx in ("0", "1"):
+            data.update({f"{field}_{idx}": value for field, value in row.items()})
+
+        resp = logged_in_client.post(
+            "/admin/import-schedule/confirm",
+            data=data,
+            follow_redirects=True,
+        )
+        assert b"Successfully imported 1 regatta" in resp.data
+        assert b"Skipped 1 regatta" in resp.data
+        assert Regatta.query.filter_by(start_date=date(2026, 10, 15)).count() == 1
+
     def test_imports_with_documents(self, app, logged_in_client, db):
         resp = logged_in_client.post(
             "/admin/import-schedule/confirm",
@@ -205,6 +273,60 @@ class TestImportScheduleConfirm:
         assert b"2 document(s) attached" in resp.data
 
 
+class TestImportScheduleDiscover:
+    @patch("app.admin.routes.discover_documents")
+    @patch("app.admin.routes._fetch_url_content", side_effect=lambda url: url)
+    def test_discovers_documents_for_each_regatta(
+        self, _mock_fetch, mock_discover, logged_in_client
+    ):
+        mock_discover.side_effect = lambda content, name, url: [
+            {"doc_type": "NOR", "url": f"{url}/nor.pdf", "label": name}
+        ]
+        resp = logged_in_client.post(
+            "/admin/import-schedule/discover",
+            data={
+                "selected": ["0", "1", "2"],
+                "name_0": "Spring",
+                "detail_url_0": "https://example.com/spring",
+                "name_1": "Summer",
+                "detail_url_1": "https://example.com/summer",
+                "name_2": "Fall",
+            },
+        )
+        body = resp.get_data(as_text=True)
+        assert "Skipping Fall" in body
+        assert body.count("Found: NOR") == 2
+        assert "Found 2 document(s) for 2 regatta(s)" in body
+        assert mock_discover.call_count == 2
+
+    @patch("app.admin.routes.discover_documents")
+    @patch("app.admin.routes._fetch_url_content", side_effect=lambda url: url)
+    def test_progress_streams_while_discovery_runs(
+        self, _mock_fetch, mock_discover, logged_in_client
+    ):
+        release = threading.Event()
+        timed_out = []
+
+        def discover(content, name, url):
+            timed_out.append(not release.wait(timeout=2))
+            return []
+
+        mock_discover.side_effect = discover
+        resp = logged_in_client.post(
+            "/admin/import-schedule/discover",
+            data={
+                "selected": ["0"],
+                "name_0": "Spring",
+                "detail_url_0": "https://example.com/spring",
+            },
+        )
+        chunks = resp.response
+        assert b"Fetching: Spring" in next(chunks)
+        release.set()
+        assert b"Spring: No documents found" in b"".join(chunks)
+        assert timed_out == [False]
+
+
 class TestDocumentReview:
     def test_missing_task_id_redirects(self, logged_in_client):
         resp = logged_in_client.get(
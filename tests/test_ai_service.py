@@ -1,145 +1,245 @@
 """Tests for app.admin.ai_service."""
 
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from unittest.mock import MagicMock, patch
 
+import orjson
 import pytest
 
-from app.admin.ai_service import (_parse_json_response, discover_documents,
-                                  discover_documents_deep, extract_regattas)
+from app.admin import ai_service
+from app.admin.ai_service import (_get_client, _parse_json_response,
+                                  discover_documents, discover_documents_deep,
+                                  extract_regattas)
+
+# Mocked API clients only; no database setup needed
+pytestmark = pytest.mark.no_db
+
+
+@pytest.fixture(autouse=True)
+def _reset_anthropic_client(app):
+    """Drop the cached client and responses so each test hits its own mock."""
+    app.extensions.pop("anthropic_client", None)
+    app.extensions.pop("ai_cache", None)
+    yield
+    app.extensions.pop("anthropic_client", None)
+    app.extensions.pop("ai_cache", None)
+
+
+@pytest.fixture()
+def anthropic_client(monkeypatch):
+    """Stand-in for the Anthropic client; set replies with _reply()."""
+    client = MagicMock()
+    monkeypatch.setattr("anthropic.Anthropic", lambda *args, **kwargs: client)
+    return client
+
+
+@dataclass(slots=True)
+class _TextBlock:
+    text: str
+
+
+@dataclass(slots=True)
+class _Message:
+    content: list[_TextBlock]
+
+
+def _reply(client, text: str) -> None:
+    """Make every messages.create() call on the mock return ``text``."""
+    client.messages.create.return_value = _Message([_TextBlock(text)])
+
 
 # --- _parse_json_response ---
 
 
 class TestParseJsonResponse:
-    def test_plain_json_array(self):
-        raw = '[{"name": "Test Regatta"}]'
-        result = _parse_json_response(raw)
-        assert result == [{"name": "Test Regatta"}]
+    @pytest.mark.parametrize(
+        "raw,expected",
+        [
+            pytest.param(
+                '[{"name": "Test Regatta"}]', [{"name": "Test Regatta"}], id="plain"
+            ),
+            pytest.param(
+                '```json\n[{"name": "Test"}]\n```', [{"name": "Test"}], id="fenced"
+            ),
+            pytest.param(
+                '```\n[{"name": "Test"}]\n```',
+                [{"name": "Test"}],
+                id="fenced-no-language",
+            ),
+            pytest.param(
+                '```json \n[{"name": "Test"}]\n```',
+                [{"name": "Test"}],
+                id="fenced-trailing-space",
+            ),
+            pytest.param(
+                '```json\n[{"name": "Test"}]```',
+                [{"name": "Test"}],
+                id="fenced-closing-on-same-line",
+            ),
+            pytest.param("[]", [], id="empty"),
+            pytest.param('  \n [{"a": 1}] \n  ', [{"a": 1}], id="whitespace"),
+        ],
+    )
+    def test_parses_array(self, raw, expected):
+        assert _parse_json_response(raw) == expected
+
+    @pytest.mark.parametrize(
+        "raw,match",
+        [
+            pytest.param("not json at all", "Could not parse", id="invalid-json"),
+            pytest.param(
+                '{"name": "not an array"}', "Unexpected AI response", id="not-array"
+            ),
+        ],
+    )
+    def test_rejects(self, raw, match):
+        with pytest.raises(ValueError, match=match):
+            _parse_json_response(raw)
+
+
+# --- _get_client ---
+
+
+class TestGetClient:
+    @patch("anthropic.Anthropic")
+    def test_client_is_reused(self, mock_cls, app):
+        assert _get_client() is _get_client()
+        mock_cls.assert_called_once_with(api_key="test-key")
+
+    @patch("anthropic.Anthropic")
+    def test_client_rebuilt_when_key_changes(self, mock_cls, app, monkeypatch):
+        mock_cls.side_effect = [MagicMock(), MagicMock()]
+        first = _get_client()
+        monkeypatch.setitem(app.config, "ANTHROPIC_API_KEY", "other-key")
+        second = _get_client()
+        assert first is not second
+        assert mock_cls.call_count == 2
+
+
+# --- extract_regattas / discover_documents / discover_documents_deep ---
+
+
+_NOR = {
+    "doc_type": "NOR",
+    "url": "http://example.com/nor.pdf",
+    "label": "Notice of Race",
+}
+_SI = {
+    "doc_type": "SI",
+    "url": "http://example.com/si.pdf",
+    "label": "Sailing Instructions",
+}
+
+
+@pytest.mark.parametrize(
+    "fn,args,expected",
+    [
+        pytest.param(
+            extract_regattas,
+            ("some content", 2026),
+            [{"name": "Test", "start_date": "2026-03-01"}],
+            id="extract_regattas",
+        ),
+        pytest.param(
+            discover_documents,
+            ("content", "Test Regatta", "http://example.com"),
+            [_NOR],
+            id="discover_documents",
+        ),
+        pytest.param(
+            discover_documents,
+            ("content", "Test", "http://example.com"),
+            [],
+            id="discover_documents-empty",
+        ),
+        pytest.param(
+            discover_documents_deep,
+            ("content", "Test Regatta", "http://example.com"),
+            [_NOR, _SI],
+            id="discover_documents_deep",
+        ),
+    ],
+)
+def test_returns_parsed_response(anthropic_client, app, fn, args, expected):
+    _reply(anthropic_client, orjson.dumps(expected).decode())
+
+    assert fn(*args) == expected
 
-    def test_strips_code_fences(self):
-        raw = '```json\n[{"name": "Test"}]\n```'
-        result = _parse_json_response(raw)
-        assert result == [{"name": "Test"}]
 
-    def test_strips_code_fences_no_language(self):
-        raw = '```\n[{"name": "Test"}]\n```'
-        result = _parse_json_response(raw)
-        assert result == [{"name": "Test"}]
+class TestExtractRegattas:
+    def test_missing_api_key_raises(self, app, monkeypatch):
+        monkeypatch.setitem(app.config, "ANTHROPIC_API_KEY", "")
+        with pytest.raises(ValueError, match="ANTHROPIC_API_KEY"):
+            extract_regattas("content", 2026)
 
-    def test_empty_array(self):
-        result = _parse_json_response("[]")
-        assert result == []
+    def test_strips_code_fences_from_response(self, anthropic_client, app):
+        _reply(anthropic_client, '```json\n[{"name": "Fenced"}]\n```')
 
-    def test_invalid_json_raises(self):
-        with pytest.raises(ValueError, match="Could not parse"):
-            _parse_json_response("not json at all")
+        result = extract_regattas("content", 2026)
+        assert result[0]["name"] == "Fenced"
 
-    def test_non_array_raises(self):
-        with pytest.raises(ValueError, match="Unexpected AI response"):
-            _parse_json_response('{"name": "not an array"}')
 
-    def test_whitespace_stripped(self):
-        raw = '  \n [{"a": 1}] \n  '
-        result = _parse_json_response(raw)
-        assert result == [{"a": 1}]
+# --- response cache ---
 
 
-# --- extract_regattas ---
+class TestResponseCache:
+    def test_identical_request_served_from_cache(self, anthropic_client, app):
+        _reply(anthropic_client, '[{"name": "Cached"}]')
 
+        first = extract_regattas("same content", 2026)
+        first[0]["is_past"] = True
+        second = extract_regattas("same content", 2026)
 
-class TestExtractRegattas:
-    @patch("app.admin.ai_service.anthropic.Anthropic")
-    def test_returns_parsed_regattas(self, mock_anthropic_cls, app):
-        mock_client = MagicMock()
-        mock_anthropic_cls.return_value = mock_client
-        mock_msg = MagicMock()
-        mock_msg.content = [
-            MagicMock(text='[{"name": "Test", "start_date": "2026-03-01"}]')
-        ]
-        mock_client.messages.create.return_value = mock_msg
-
-        with app.app_context():
-            result = extract_regattas("some content", 2026)
-            assert len(result) == 1
-            assert result[0]["name"] == "Test"
-
-    def test_missing_api_key_raises(self, app):
-        app.config["ANTHROPIC_API_KEY"] = ""
-        with app.app_context():
-            with pytest.raises(ValueError, match="ANTHROPIC_API_KEY"):
+        assert second == [{"name": "Cached"}]
+        assert anthropic_client.messages.create.call_count == 1
+
+    def test_different_input_calls_api(self, anthropic_client, app):
+        _reply(anthropic_client, "[]")
+
+        extract_regattas("content", 2026)
+        extract_regattas("content", 2027)
+        extract_regattas("other content", 2026)
+
+        assert anthropic_client.messages.create.call_count == 3
+
+    def test_unparseable_response_not_cached(self, anthropic_client, app):
+        _reply(anthropic_client, "not json")
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
                 extract_regattas("content", 2026)
-        app.config["ANTHROPIC_API_KEY"] = "test-key"
-
-    @patch("app.admin.ai_service.anthropic.Anthropic")
-    def test_strips_code_fences_from_response(self, mock_cls, app):
-        mock_client = MagicMock()
-        mock_cls.return_value = mock_client
-        mock_msg = MagicMock()
-        mock_msg.content = [MagicMock(text='```json\n[{"name": "Fenced"}]\n```')]
-        mock_client.messages.create.return_value = mock_msg
-
-        with app.app_context():
-            result = extract_regattas("content", 2026)
-            assert result[0]["name"] == "Fenced"
-
-
-# --- discover_documents ---
-
-
-class TestDiscoverDocuments:
-    @patch("app.admin.ai_service.anthropic.Anthropic")
-    def test_returns_documents(self, mock_cls, app):
-        mock_client = MagicMock()
-        mock_cls.return_value = mock_client
-        mock_msg = MagicMock()
-        mock_msg.content = [
-            MagicMock(
-                text='[{"doc_type": "NOR", "url": "http://example.com/nor.pdf", '
-                '"label": "Notice of Race"}]'
-            )
-        ]
-        mock_client.messages.create.return_value = mock_msg
-
-        with app.app_context():
-            result = discover_documents("content", "Test Regatta", "http://example.com")
-            assert len(result) == 1
-            assert result[0]["doc_type"] == "NOR"
-
-    @patch("app.admin.ai_service.anthropic.Anthropic")
-    def test_empty_result(self, mock_cls, app):
-        mock_client = MagicMock()
-        mock_cls.return_value = mock_client
-        mock_msg = MagicMock()
-        mock_msg.content = [MagicMock(text="[]")]
-        mock_client.messages.create.return_value = mock_msg
-
-        with app.app_context():
-            result = discover_documents("content", "Test", "http://example.com")
-            assert result == []
-
-
-# --- discover_documents_deep ---
-
-
-class TestDiscoverDocumentsDeep:
-    @patch("app.admin.ai_service.anthropic.Anthropic")
-    def test_returns_nor_si_only(self, mock_cls, app):
-        mock_client = MagicMock()
-        mock_cls.return_value = mock_client
-        mock_msg = MagicMock()
-        mock_msg.content = [
-            MagicMock(
-                text='[{"doc_type": "NOR", "url": "http://example.com/nor.pdf", '
-                '"label": "Notice of Race"}, '
-                '{"doc_type": "SI", "url": "http://example.com/si.pdf", '
-                '"label": "Sailing Instructions"}]'
-            )
-        ]
-        mock_client.messages.create.return_value = mock_msg
-
-        with app.app_context():
-            result = discover_documents_deep(
-                "content", "Test Regatta", "http://example.com"
-            )
-            assert len(result) == 2
-            assert {d["doc_type"] for d in result} == {"NOR", "SI"}
+
+        assert anthropic_client.messages.create.call_count == 2
+
+    def test_eviction_during_lookup_waits_for_lock(self, app, monkeypatch):
+        monkeypatch.setattr(ai_service, "AI_CACHE_SIZE", 1)
+        ai_service._cache_response("a", "[]")
+        threads = []
+
+        def evict():
+            with app.app_context():
+                ai_service._cache_response("b", "[]")
+
+        class RacingCache(OrderedDict):
+            def get(self, key, default=None):
+                raw = super().get(key, default)
+                # Another thread caches a new prompt, evicting this one
+                thread = threading.Thread(target=evict)
+                thread.start()
+                thread.join(timeout=0.1)
+                threads.append(thread)
+                return raw
+
+        app.extensions["ai_cache"] = cache = RacingCache(app.extensions["ai_cache"])
+        assert ai_service._get_cached_response("a") == "[]"
+        threads[0].join()
+        assert list(cache) == [ai_service._cache_key("b")]
+
+    def test_cache_is_bounded(self, app, monkeypatch):
+        monkeypatch.setattr(ai_service, "AI_CACHE_SIZE", 2)
+        for prompt in ("a", "b", "c"):
+            ai_service._cache_response(prompt, "[]")
+        assert ai_service._get_cached_response("a") is None
+        assert ai_service._get_cached_response("c") == "[]"
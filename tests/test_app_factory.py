@@ -1,6 +1,10 @@
 """Tests for the Flask app factory and core setup."""
 
-from app import __version__, create_app
+from datetime import date
+from types import SimpleNamespace
+
+from app import __version__, create_app, sort_rsvps
+from app.models import RSVP, Regatta, User
 
 
 class TestAppFactory:
@@ -27,3 +31,64 @@ class TestAppFactory:
         resp = client.get("/login", follow_redirects=True)
         assert resp.status_code == 200
         assert b"Race Crew Network" in resp.data
+
+
+class TestSortRsvpsFilter:
+    def _rsvp(self, status, name):
+        return SimpleNamespace(status=status, user=SimpleNamespace(display_name=name))
+
+    def test_registered_as_template_filter(self, app):
+        assert app.jinja_env.filters["sort_rsvps"] is sort_rsvps
+
+    def test_orders_by_status_then_name(self):
+        rsvps = [
+            self._rsvp("maybe", "Alice"),
+            self._rsvp("no", "Bob"),
+            self._rsvp("yes", "Zed"),
+            self._rsvp("yes", "Amy"),
+        ]
+        result = sort_rsvps(rsvps)
+        assert [(r.status, r.user.display_name) for r in result] == [
+            ("yes", "Amy"),
+            ("yes", "Zed"),
+            ("no", "Bob"),
+            ("maybe", "Alice"),
+        ]
+
+    def test_unknown_status_sorts_last(self):
+        rsvps = [self._rsvp("other", "Amy"), self._rsvp("maybe", "Zed")]
+        assert [r.status for r in sort_rsvps(rsvps)] == ["maybe", "other"]
+
+    def test_ties_do_not_compare_rsvps(self):
+        rsvps = [self._rsvp("yes", "Amy"), self._rsvp("yes", "Amy")]
+        assert sort_rsvps(rsvps) == rsvps
+
+    def test_sorts_loaded_relationship(self, db, admin_user):
+        regatta = Regatta(
+            name="Sorted",
+            location="Club",
+            start_date=date(2026, 6, 1),
+            created_by=admin_user.id,
+        )
+        db.session.add(regatta)
+        for i, (status, name) in enumerate(
+            [("maybe", "Alice"), ("no", "Bob"), ("yes", "Zed"), ("yes", "Amy")]
+        ):
+            user = User(
+                email=f"crew{i}@test.com",
+                display_name=name,
+                initials=name[:2].upper(),
+                password_hash="x",
+            )
+            db.session.add(user)
+            db.session.add(RSVP(regatta=regatta, user=user, status=status))
+        db.session.commit()
+
+        db.session.expire(regatta)
+        result = sort_rsvps(regatta.rsvps)
+        assert [(r.status, r.user.display_name) for r in result] == [
+            ("yes", "Amy"),
+            ("yes", "Zed"),
+            ("no", "Bob"),
+            ("maybe", "Alice"),
+        ]
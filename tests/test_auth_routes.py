@@ -0,0 +1,77 @@
+"""Tests for auth routes (invites and profile edits)."""
+
+from app.models import User
+
+
+def _crew(db, email="crew@test.com"):
+    user = User(email=email, display_name="Crew", initials="CR")
+    user.set_password("password")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+class TestInviteUser:
+    def test_invite_creates_pending_user(self, logged_in_client):
+        resp = logged_in_client.post(
+            "/admin/users/invite",
+            data={"email": "New@Test.com"},
+            follow_redirects=True,
+        )
+        assert b"Invite link:" in resp.data
+        user = User.query.filter_by(email="new@test.com").one()
+        assert user.invite_token
+
+    def test_invite_existing_email_is_rejected(self, logged_in_client, db):
+        _crew(db)
+        resp = logged_in_client.post(
+            "/admin/users/invite",
+            data={"email": "crew@test.com"},
+            follow_redirects=True,
+        )
+        assert b"A user with that email already exists." in resp.data
+        assert User.query.filter_by(email="crew@test.com").count() == 1
+
+
+class TestEmailChanges:
+    def test_profile_email_in_use(self, logged_in_client, db, admin_user):
+        _crew(db)
+        resp = logged_in_client.post(
+            "/profile",
+            data={
+                "display_name": "Admin",
+                "initials": "AD",
+                "email": "crew@test.com",
+            },
+        )
+        assert b"That email is already in use." in resp.data
+        db.session.refresh(admin_user)
+        assert admin_user.email == "admin@test.com"
+
+    def test_edit_user_email_in_use(self, logged_in_client, db):
+        crew = _crew(db)
+        resp = logged_in_client.post(
+            f"/admin/users/{crew.id}/edit",
+            data={
+                "display_name": "Crew",
+                "initials": "CR",
+                "email": "admin@test.com",
+            },
+        )
+        assert b"That email is already in use." in resp.data
+        db.session.refresh(crew)
+        assert crew.email == "crew@test.com"
+
+    def test_edit_user_keeps_own_email(self, logged_in_client, db):
+        crew = _crew(db)
+        resp = logged_in_client.post(
+            f"/admin/users/{crew.id}/edit",
+            data={
+                "display_name": "Crew Renamed",
+                "initials": "CR",
+                "email": "crew@test.com",
+            },
+        )
+        assert resp.status_code == 302
+        db.session.refresh(crew)
+        assert crew.display_name == "Crew Renamed"
@@ -0,0 +1,158 @@
+"""Tests for the iCal subscription feed."""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from app.calendar import routes
+from app.models import RSVP, Regatta
+
+
+@pytest.fixture(autouse=True)
+def _empty_feed_cache():
+    routes._feed_cache.clear()
+    yield
+    routes._feed_cache.clear()
+
+
+@pytest.fixture()
+def subscriber(db, admin_user):
+    admin_user.calendar_token = "feed-token"
+    regatta = Regatta(
+        name="Midwinters",
+        location="Test YC",
+        start_date=date(2026, 3, 1),
+        created_by=admin_user.id,
+    )
+    db.session.add(regatta)
+    db.session.add(RSVP(regatta=regatta, user=admin_user, status="yes"))
+    db.session.commit()
+    return admin_user
+
+
+class TestIcalFeed:
+    def test_unknown_token_is_404(self, client):
+        assert client.get("/calendar/nope.ics").status_code == 404
+
+    def test_feed_lists_regattas_and_crew(self, client, subscriber):
+        resp = client.get("/calendar/feed-token.ics")
+        assert resp.status_code == 200
+        body = resp.get_data(as_text=True)
+        assert "SUMMARY:Midwinters" in body
+        assert "AD: Yes" in body
+        assert "Your RSVP: Yes" in body
+        assert resp.headers["ETag"]
+
+    def test_text_is_escaped_and_long_lines_folded(self, client, db, subscriber):
+        regatta = Regatta.query.one()
+        regatta.location = "Lake Norman YC, Mooresville; NC"
+        regatta.notes = "Long notes " * 20
+        db.session.commit()
+
+        body = client.get("/calendar/feed-token.ics").get_data()
+        assert b"LOCATION:Lake Norman YC\\, Mooresville\\; NC\r\n" in body
+        assert all(len(line) <= 75 for line in body.split(b"\r\n"))
+        assert body.replace(b"\r\n ", b"").count(b"Long notes") == 20
+
+    def test_query_count_does_not_grow_with_regattas(self, client, db, subscriber):
+        def count_queries():
+            statements = []
+
+            def before_cursor_execute(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            engine = db.engine
+            event.listen(engine, "before_cursor_execute", before_cursor_execute)
+            try:
+                routes._feed_cache.clear()
+                assert client.get("/calendar/feed-token.ics").status_code == 200
+            finally:
+                event.remove(engine, "before_cursor_execute", before_cursor_execute)
+            return len(statements)
+
+        baseline = count_queries()
+        for day in range(2, 6):
+            regatta = Regatta(
+                name=f"Race {day}",
+                location="Test YC",
+                start_date=date(2026, 3, day),
+                created_by=subscriber.id,
+            )
+            db.session.add(regatta)
+            db.session.add(RSVP(regatta=regatta, user=subscriber, status="no"))
+        db.session.commit()
+
+        assert count_queries() == baseline
+
+    def test_unchanged_feed_returns_304(self, client, subscriber):
+        etag = client.get("/calendar/feed-token.ics").headers["ETag"]
+        resp = client.get("/calendar/feed-token.ics", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+
+    def test_unchanged_feed_reads_no_rsvp_rows(self, client, db, subscriber):
+        etag = client.get("/calendar/feed-token.ics").headers["ETag"]
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            resp = client.get(
+                "/calendar/feed-token.ics", headers={"If-None-Match": etag}
+            )
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+        assert resp.status_code == 304
+        assert not any("rsvps.status" in statement for statement in statements)
+
+    def test_initials_change_invalidates_etag(self, client, db, subscriber):
+        etag = client.get("/calendar/feed-token.ics").headers["ETag"]
+        subscriber.initials = "ZZ"
+        db.session.commit()
+
+        resp = client.get("/calendar/feed-token.ics", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert "ZZ: Yes" in resp.get_data(as_text=True)
+
+    def test_feed_is_revalidated_by_etag_only(self, client, subscriber):
+        resp = client.get("/calendar/feed-token.ics")
+        assert resp.cache_control.private
+        assert resp.cache_control.max_age == 300
+        assert "Last-Modified" not in resp.headers
+
+    def test_deleted_regatta_with_if_modified_since(self, client, db, subscriber):
+        db.session.add(
+            Regatta(
+                name="Spring Series",
+                location="Test YC",
+                start_date=date(2026, 4, 1),
+                created_by=subscriber.id,
+            )
+        )
+        db.session.commit()
+        assert client.get("/calendar/feed-token.ics").status_code == 200
+        db.session.delete(Regatta.query.filter_by(name="Midwinters").one())
+        db.session.commit()
+
+        # A date after every remaining row's updated_at
+        resp = client.get(
+            "/calendar/feed-token.ics",
+            headers={"If-Modified-Since": "Wed, 02 Jan 2030 03:04:05 GMT"},
+        )
+        assert resp.status_code == 200
+        body = resp.get_data(as_text=True)
+        assert "Midwinters" not in body
+        assert "Spring Series" in body
+
+    def test_rsvp_change_invalidates_etag(self, client, db, subscriber):
+        etag = client.get("/calendar/feed-token.ics").headers["ETag"]
+        rsvp = RSVP.query.filter_by(user_id=subscriber.id).one()
+        rsvp.status = "maybe"
+        db.session.commit()
+
+        resp = client.get("/calendar/feed-token.ics", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert "Your RSVP: Maybe" in resp.get_data(as_text=True)
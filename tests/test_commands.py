@@ -0,0 +1,57 @@
+"""Tests for the flask CLI commands."""
+
+from app.models import User
+
+
+class TestImportUsers:
+    def test_creates_users_and_skips_existing(self, app, db, admin_user, tmp_path):
+        csv_path = tmp_path / "users.csv"
+        csv_path.write_text(
+            "email,password,display_name,initials,is_admin\n"
+            "Crew@Test.com,secret123,Crew One,c1,\n"
+            "admin@test.com,other123,Admin Again,AA,yes\n"
+            "skipper@test.com,secret456,Skipper,sk,yes\n"
+        )
+
+        result = app.test_cli_runner().invoke(args=["import-users", str(csv_path)])
+
+        assert result.exit_code == 0
+        assert "Skipping admin@test.com" in result.output
+        assert "Created 2 user(s)." in result.output
+        crew = User.query.filter_by(email="crew@test.com").one()
+        assert crew.initials == "C1"
+        assert crew.is_admin is False
+        assert crew.check_password("secret123")
+        assert User.query.filter_by(email="skipper@test.com").one().is_admin is True
+        assert User.query.count() == 3
+
+    def test_invalid_rows_are_skipped(self, app, db, tmp_path):
+        csv_path = tmp_path / "users.csv"
+        csv_path.write_text(
+            "email,password,display_name,initials\n"
+            "blank@test.com,,Blank,BL\n"
+            "short@test.com,secret123\n"
+            "long@test.com,secret123,Long,ABCD\n"
+            "ok@test.com,secret123,Crew,OK\n"
+            "OK@test.com,secret456,Crew Again,CA\n"
+        )
+
+        result = app.test_cli_runner().invoke(args=["import-users", str(csv_path)])
+
+        assert result.exit_code == 0
+        assert "Skipping line 2: Password must be at least 6" in result.output
+        assert "Skipping line 3: Name and initials are required." in result.output
+        assert "Skipping line 4: Initials must be 2-3 characters." in result.output
+        assert "Skipping line 6: duplicate email ok@test.com" in result.output
+        assert "Created 1 user(s)." in result.output
+        assert [u.email for u in User.query.all()] == ["ok@test.com"]
+
+    def test_missing_columns_is_an_error(self, app, db, tmp_path):
+        csv_path = tmp_path / "users.csv"
+        csv_path.write_text("email,password\ncrew@test.com,secret123\n")
+
+        result = app.test_cli_runner().invoke(args=["import-users", str(csv_path)])
+
+        assert result.exit_code == 1
+        assert "display_name, initials" in result.output
+        assert User.query.count() == 0
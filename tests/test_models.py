@@ -1,12 +1,22 @@
 """Tests for app.models."""
 
 from datetime import date
+from unittest.mock import patch
 
 import pytest
+from sqlalchemy import func, insert, select
 
+from app import models
 from app.models import RSVP, Document, Regatta, User
 
 
+def _count(db, model, regatta_id: int) -> int:
+    """Rows of ``model`` still pointing at a regatta, counted in SQL."""
+    return db.session.scalar(
+        select(func.count()).select_from(model).where(model.regatta_id == regatta_id)
+    )
+
+
 class TestUserModel:
     def test_set_and_check_password(self, app, db):
         user = User(
@@ -18,108 +28,148 @@ class TestUserModel:
         db.session.add(user)
         db.session.commit()
 
+        assert user.password_hash != "secret123"
+        assert len(user.password_hash) > 20
         assert user.check_password("secret123") is True
         assert user.check_password("wrong") is False
 
-    def test_password_is_hashed(self, app, db):
-        user = User(
-            email="test2@test.com",
-            display_name="Test",
-            initials="T2",
+    def test_password_hash_uses_configured_rounds(self, app, db, monkeypatch):
+        monkeypatch.setitem(app.config, "BCRYPT_ROUNDS", 5)
+        user = User(email="r@test.com", display_name="R", initials="RR")
+        user.set_password("secret123")
+        assert user.password_hash.startswith("$2b$05$")
+        assert user.check_password("secret123") is True
+
+    def test_password_needs_rehash_after_rounds_change(self, app, monkeypatch):
+        user = User(email="h@test.com", display_name="H", initials="HH")
+        user.set_password("secret123")
+        assert user.password_needs_rehash() is False
+
+        monkeypatch.setitem(app.config, "BCRYPT_ROUNDS", 5)
+        assert user.password_needs_rehash() is True
+
+    def test_login_rehashes_password_at_configured_rounds(
+        self, app, db, client, admin_user, monkeypatch
+    ):
+        monkeypatch.setitem(app.config, "BCRYPT_ROUNDS", 5)
+        resp = client.post(
+            "/login", data={"email": "admin@test.com", "password": "password"}
         )
-        user.set_password("mypassword")
-        assert user.password_hash != "mypassword"
-        assert len(user.password_hash) > 20
+        assert resp.status_code == 302
+        db.session.refresh(admin_user)
+        assert admin_user.password_hash.startswith("$2b$05$")
+
+
+class TestVerifyPasswordCache:
+    @pytest.fixture(autouse=True)
+    def _enable_cache(self, app, monkeypatch):
+        monkeypatch.setitem(app.config, "VERIFY_PASSWORD_CACHE_TTL", 300)
+        models._verified_passwords.clear()
+        yield
+        models._verified_passwords.clear()
+
+    def _user(self):
+        user = User(email="c@test.com", display_name="C", initials="CC")
+        user.set_password("secret123")
+        return user
+
+    def test_repeat_check_skips_bcrypt(self):
+        user = self._user()
+        assert user.check_password("secret123") is True
+        with patch("app.models.bcrypt.checkpw") as mock_checkpw:
+            assert user.check_password("secret123") is True
+        mock_checkpw.assert_not_called()
+
+    def test_failed_check_is_not_cached(self):
+        user = self._user()
+        assert user.check_password("wrong") is False
+        assert models._verified_passwords == {}
+
+    def test_password_change_invalidates(self):
+        user = self._user()
+        assert user.check_password("secret123") is True
+        user.set_password("newsecret")
+        assert user.check_password("secret123") is False
 
 
 class TestRegattaModel:
-    def test_create_regatta(self, app, db, admin_user):
+    @pytest.fixture()
+    def regatta(self, db, admin_user):
+        """A committed regatta with only the required fields set."""
         regatta = Regatta(
             name="Test Regatta",
             location="Test Yacht Club",
             start_date=date(2026, 6, 15),
-            end_date=date(2026, 6, 16),
             created_by=admin_user.id,
         )
         db.session.add(regatta)
         db.session.commit()
+        return regatta
 
+    def test_create_regatta(self, regatta):
         assert regatta.id is not None
         assert regatta.name == "Test Regatta"
 
-    def test_boat_class_defaults_to_tbd(self, app, db, admin_user):
+    @pytest.mark.parametrize(
+        "kwargs,expected",
+        [({}, "TBD"), ({"boat_class": "Thistle"}, "Thistle")],
+        ids=["default", "explicit"],
+    )
+    def test_boat_class(self, db, admin_user, kwargs, expected):
         regatta = Regatta(
-            name="Default Class Test",
-            location="Test YC",
-            start_date=date(2026, 6, 20),
-            created_by=admin_user.id,
-        )
-        db.session.add(regatta)
-        db.session.commit()
-
-        assert regatta.boat_class == "TBD"
-
-    def test_boat_class_explicit_value(self, app, db, admin_user):
-        regatta = Regatta(
-            name="Thistle Regatta",
-            boat_class="Thistle",
+            name="Class Test",
             location="Test YC",
             start_date=date(2026, 6, 21),
             created_by=admin_user.id,
+            **kwargs,
         )
         db.session.add(regatta)
         db.session.commit()
 
-        assert regatta.boat_class == "Thistle"
+        assert regatta.boat_class == expected
 
-    def test_regatta_cascade_delete_documents(self, app, db, admin_user):
-        regatta = Regatta(
-            name="Cascade Test",
-            location="Test",
-            start_date=date(2026, 7, 1),
-            created_by=admin_user.id,
+    def test_effective_location_url(self):
+        regatta = Regatta(location="Lake Norman YC, NC")
+        assert regatta.effective_location_url == (
+            "https://www.google.com/maps/search/Lake+Norman+YC%2C+NC"
         )
-        db.session.add(regatta)
-        db.session.flush()
-
-        doc = Document(
-            regatta_id=regatta.id,
-            doc_type="NOR",
-            url="https://example.com/nor.pdf",
-            uploaded_by=admin_user.id,
+        regatta.location_url = "https://example.com/venue"
+        assert regatta.effective_location_url == "https://example.com/venue"
+
+    def test_regatta_cascade_delete_documents(self, db, admin_user, regatta):
+        # Inserted behind the ORM's back, so the delete relies on the
+        # database's ON DELETE CASCADE rather than a loaded collection
+        db.session.execute(
+            insert(Document),
+            [
+                {
+                    "regatta_id": regatta.id,
+                    "doc_type": "NOR",
+                    "url": "https://example.com/nor.pdf",
+                    "uploaded_by": admin_user.id,
+                }
+            ],
         )
-        db.session.add(doc)
         db.session.commit()
 
         regatta_id = regatta.id
         db.session.delete(regatta)
         db.session.commit()
 
-        assert Document.query.filter_by(regatta_id=regatta_id).count() == 0
+        assert _count(db, Document, regatta_id) == 0
 
-    def test_regatta_cascade_delete_rsvps(self, app, db, admin_user):
-        regatta = Regatta(
-            name="RSVP Cascade",
-            location="Test",
-            start_date=date(2026, 7, 1),
-            created_by=admin_user.id,
+    def test_regatta_cascade_delete_rsvps(self, db, admin_user, regatta):
+        db.session.execute(
+            insert(RSVP),
+            [{"regatta_id": regatta.id, "user_id": admin_user.id, "status": "yes"}],
         )
-        db.session.add(regatta)
-        db.session.flush()
-
-        rsvp = RSVP(
-            regatta_id=regatta.id,
-            user_id=admin_user.id,
-            status="yes",
-        )
-        db.session.add(rsvp)
         db.session.commit()
 
         regatta_id = regatta.id
         db.session.delete(regatta)
         db.session.commit()
 
-        assert RSVP.query.filter_by(regatta_id=regatta_id).count() == 0
+        assert _count(db, RSVP, regatta_id) == 0
 
 
 class TestDocumentModel:
@@ -130,11 +180,8 @@ class TestDocumentModel:
             start_date=date(2026, 8, 1),
             created_by=admin_user.id,
         )
-        db.session.add(regatta)
-        db.session.flush()
-
         doc = Document(
-            regatta_id=regatta.id,
+            regatta=regatta,
             doc_type="WWW",
             url="https://example.com/regatta",
             uploaded_by=admin_user.id,
@@ -0,0 +1,236 @@
+"""Tests for the schedule pages."""
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.models import RSVP, Document, Regatta
+from app.regattas import routes
+
+
+@pytest.fixture(autouse=True)
+def _empty_pdf_cache():
+    routes._pdf_cache.clear()
+    yield
+    routes._pdf_cache.clear()
+
+
+@pytest.fixture()
+def regatta(db, admin_user):
+    regatta = Regatta(
+        name="Midwinters",
+        location="Test YC",
+        start_date=date.today() + timedelta(days=30),
+        created_by=admin_user.id,
+    )
+    db.session.add(regatta)
+    db.session.add(RSVP(regatta=regatta, user=admin_user, status="yes"))
+    db.session.commit()
+    return regatta
+
+
+class TestSchedulePdf:
+    def test_unchanged_schedule_reuses_rendered_pdf(self, logged_in_client, regatta):
+        with patch("app.regattas.routes.HTML") as mock_html:
+            mock_html.return_value.write_pdf.return_value = b"%PDF-1"
+            first = logged_in_client.get("/schedule.pdf")
+            second = logged_in_client.get("/schedule.pdf")
+
+        assert first.data == second.data == b"%PDF-1"
+        assert first.headers["Content-Type"] == "application/pdf"
+        mock_html.return_value.write_pdf.assert_called_once()
+
+    def test_changed_schedule_is_rendered_again(self, logged_in_client, db, regatta):
+        with patch("app.regattas.routes.HTML") as mock_html:
+            mock_html.return_value.write_pdf.return_value = b"%PDF-1"
+            logged_in_client.get("/schedule.pdf")
+            regatta.rsvps[0].status = "no"
+            db.session.commit()
+            logged_in_client.get("/schedule.pdf")
+
+        assert mock_html.return_value.write_pdf.call_count == 2
+
+    def test_font_configuration_is_shared_between_renders(
+        self, logged_in_client, db, regatta, monkeypatch
+    ):
+        monkeypatch.setattr(routes, "_pdf_font_config", None)
+        with patch("app.regattas.routes.HTML") as mock_html, patch(
+            "app.regattas.routes.FontConfiguration"
+        ) as mock_font_config:
+            mock_html.return_value.write_pdf.return_value = b"%PDF-1"
+            logged_in_client.get("/schedule.pdf")
+            regatta.rsvps[0].status = "no"
+            db.session.commit()
+            logged_in_client.get("/schedule.pdf")
+
+        mock_font_config.assert_called_once_with()
+        for call in mock_html.return_value.write_pdf.call_args_list:
+            assert call.kwargs["font_config"] is mock_font_config.return_value
+
+    def test_matching_etag_returns_304(self, logged_in_client, regatta):
+        with patch("app.regattas.routes.HTML") as mock_html:
+            mock_html.return_value.write_pdf.return_value = b"%PDF-1"
+            etag = logged_in_client.get("/schedule.pdf").headers["ETag"]
+            resp = logged_in_client.get(
+                "/schedule.pdf", headers={"If-None-Match": etag}
+            )
+
+        assert resp.status_code == 304
+
+
+class TestLoadSchedule:
+    def test_splits_upcoming_and_past_around_today(self, app, db, admin_user):
+        today = date(2026, 6, 15)
+        for name, offset in [("B", -10), ("D", 5), ("A", -20), ("T", 0), ("E", 9)]:
+            db.session.add(
+                Regatta(
+                    name=name,
+                    location="Test YC",
+                    start_date=today + timedelta(days=offset),
+                    created_by=admin_user.id,
+                )
+            )
+        db.session.commit()
+
+        upcoming, past = routes._load_schedule(today)
+
+        assert [r.name for r in upcoming] == ["T", "D", "E"]
+        assert [r.name for r in past] == ["B", "A"]
+
+
+class TestDeleteRegatta:
+    def test_delete_cascades_to_rsvps_and_documents(
+        self, logged_in_client, db, admin_user, regatta
+    ):
+        db.session.add(
+            Document(
+                regatta_id=regatta.id,
+                doc_type="NOR",
+                url="https://example.com/nor.pdf",
+                uploaded_by=admin_user.id,
+            )
+        )
+        db.session.commit()
+
+        resp = logged_in_client.post(
+            f"/regattas/{regatta.id}/delete", follow_redirects=True
+        )
+
+        assert b"Regatta &#39;Midwinters&#39; deleted." in resp.data
+        assert Regatta.query.count() == 0
+        assert RSVP.query.count() == 0
+        assert Document.query.count() == 0
+
+    def test_bulk_delete(self, logged_in_client, db, admin_user, regatta):
+        other = Regatta(
+            name="Spring Series",
+            location="Test YC",
+            start_date=date.today() + timedelta(days=60),
+            created_by=admin_user.id,
+        )
+        db.session.add(other)
+        db.session.commit()
+
+        resp = logged_in_client.post(
+            "/regattas/bulk-delete",
+            data={"selected": [str(regatta.id), str(other.id), "bogus"]},
+            follow_redirects=True,
+        )
+
+        assert b"Deleted 2 regatta(s)." in resp.data
+        assert Regatta.query.count() == 0
+        assert RSVP.query.count() == 0
+
+
+class TestRsvp:
+    def test_first_rsvp_is_created(self, logged_in_client, db, admin_user):
+        regatta = Regatta(
+            name="Spring Series",
+            location="Test YC",
+            start_date=date.today() + timedelta(days=60),
+            created_by=admin_user.id,
+        )
+        db.session.add(regatta)
+        db.session.commit()
+
+        resp = logged_in_client.post(
+            f"/regattas/{regatta.id}/rsvp", data={"status": "Maybe"}
+        )
+
+        assert resp.status_code == 302
+        rsvp = RSVP.query.filter_by(regatta_id=regatta.id).one()
+        assert (rsvp.user_id, rsvp.status) == (admin_user.id, "maybe")
+
+    def test_existing_rsvp_is_updated(self, logged_in_client, db, regatta):
+        logged_in_client.post(f"/regattas/{regatta.id}/rsvp", data={"status": "no"})
+
+        db.session.expire_all()
+        assert [r.status for r in RSVP.query.all()] == ["no"]
+
+    @pytest.mark.parametrize("dialect", ["mysql", "postgresql", "sqlite"])
+    def test_upsert_uses_the_dialects_insert(self, db, dialect, monkeypatch):
+        bind = SimpleNamespace(dialect=SimpleNamespace(name=dialect))
+        monkeypatch.setattr(db.session, "get_bind", lambda: bind)
+        with patch.object(db.session, "execute") as mock_execute:
+            routes._upsert_rsvp(1, 1, "yes")
+
+        stmt = mock_execute.call_args.args[0]
+        assert type(stmt).__module__ == f"sqlalchemy.dialects.{dialect}.dml"
+
+    def test_other_databases_read_before_writing(
+        self, db, admin_user, regatta, monkeypatch
+    ):
+        bind = SimpleNamespace(dialect=SimpleNamespace(name="oracle"))
+        monkeypatch.setattr(db.session, "get_bind", lambda: bind)
+        routes._upsert_rsvp(regatta.id, admin_user.id, "maybe")
+        db.session.commit()
+
+        assert [r.status for r in RSVP.query.all()] == ["maybe"]
+
+    def test_invalid_status_is_rejected(self, logged_in_client, regatta):
+        resp = logged_in_client.post(
+            f"/regattas/{regatta.id}/rsvp",
+            data={"status": "perhaps"},
+            follow_redirects=True,
+        )
+        assert b"Invalid RSVP status." in resp.data
+        assert RSVP.query.one().status == "yes"
+
+
+class TestEditRegatta:
+    def test_edit_form_shows_notes_and_documents(
+        self, logged_in_client, db, admin_user, regatta
+    ):
+        regatta.notes = "Bring a spinnaker"
+        db.session.add(
+            Document(
+                regatta_id=regatta.id,
+                doc_type="NOR",
+                url="https://example.com/nor.pdf",
+                uploaded_by=admin_user.id,
+            )
+        )
+        db.session.commit()
+        regatta_id = regatta.id
+        db.session.expunge_all()
+
+        resp = logged_in_client.get(f"/regattas/{regatta_id}/edit")
+
+        assert resp.status_code == 200
+        assert b"Bring a spinnaker" in resp.data
+        assert b"NOR" in resp.data
+
+    def test_upload_link_document(self, logged_in_client, db, regatta):
+        regatta_id = regatta.id
+        db.session.expunge_all()
+
+        resp = logged_in_client.post(
+            f"/regattas/{regatta_id}/upload",
+            data={"doc_type": "SI", "doc_url": "https://example.com/si.pdf"},
+            follow_redirects=True,
+        )
+
+        assert b"SI link added." in resp.data
+        assert Document.query.filter_by(regatta_id=regatta_id).one().doc_type == "SI"
@@ -0,0 +1,70 @@
+"""Tests for app.storage."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app import storage
+from app.storage import _get_client, delete_file, get_file_url
+
+# Mocked API clients only; no database setup needed
+pytestmark = pytest.mark.no_db
+
+
+@pytest.fixture(autouse=True)
+def _reset_s3_client(app):
+    """Drop the cached client and URLs so each test hits its own mock."""
+    app.extensions.pop("s3_client", None)
+    storage._presigned_urls.clear()
+    yield
+    app.extensions.pop("s3_client", None)
+    storage._presigned_urls.clear()
+
+
+class TestGetClient:
+    @patch("app.storage.boto3.client")
+    def test_client_is_reused(self, mock_client, app):
+        region = app.config["AWS_REGION"]
+        assert _get_client() is _get_client()
+        mock_client.assert_called_once_with(
+            "s3",
+            region_name=region,
+            endpoint_url=f"https://s3.{region}.amazonaws.com",
+        )
+
+    @patch("app.storage.boto3.client")
+    def test_client_rebuilt_when_region_changes(self, mock_client, app, monkeypatch):
+        mock_client.side_effect = [MagicMock(), MagicMock()]
+        first = _get_client()
+        monkeypatch.setitem(app.config, "AWS_REGION", "us-west-2")
+        second = _get_client()
+        assert first is not second
+        assert mock_client.call_count == 2
+
+
+class TestGetFileUrl:
+    @patch("app.storage._get_client")
+    def test_url_is_reused(self, mock_get_client, app):
+        client = mock_get_client.return_value
+        client.generate_presigned_url.side_effect = ["https://s3/a?sig=1"]
+        assert get_file_url("a.pdf") == "https://s3/a?sig=1"
+        assert get_file_url("a.pdf") == "https://s3/a?sig=1"
+        client.generate_presigned_url.assert_called_once()
+
+    @patch("app.storage._get_client")
+    def test_url_renewed_before_it_expires(self, mock_get_client, app):
+        client = mock_get_client.return_value
+        client.generate_presigned_url.side_effect = ["https://s3/1", "https://s3/2"]
+        with patch("app.storage.time.monotonic", return_value=1000.0):
+            assert get_file_url("a.pdf") == "https://s3/1"
+        later = 1000.0 + storage.PRESIGNED_URL_REUSE + 1
+        with patch("app.storage.time.monotonic", return_value=later):
+            assert get_file_url("a.pdf") == "https://s3/2"
+
+    @patch("app.storage._get_client")
+    def test_delete_forgets_url(self, mock_get_client, app):
+        client = mock_get_client.return_value
+        client.generate_presigned_url.side_effect = ["https://s3/1", "https://s3/2"]
+        get_file_url("a.pdf")
+        delete_file("a.pdf")
+        assert get_file_url("a.pdf") == "https://s3/2"